@@ -22,7 +22,12 @@ else:
 
 def create_db_and_tables():
     """Create database and tables"""
+    from app.core.indexes import create_indexes
+    from app.core.rollups import create_rollups
+
     SQLModel.metadata.create_all(engine)
+    create_indexes(engine)
+    create_rollups(engine)
 
 
 def get_session():
@@ -0,0 +1,49 @@
+"""
+Composite database indexes backing the report and scheduling queries
+"""
+from app.models.audit_log import AuditLog
+from app.models.case import Case, CaseStatus
+from app.models.hearing import Hearing
+from sqlalchemy import Index
+from sqlalchemy.engine import Engine
+
+PENDING_STATUSES = (CaseStatus.FILED, CaseStatus.UNDER_REVIEW)
+
+# Reports: filing-date windows grouped by status/track, clerk dashboard counts,
+# hearing workload per bench, judge dashboard counts and day listings ordered by start time
+REPORT_INDEXES = [
+    Index("ix_case_filing_status", Case.filing_date, Case.status),
+    Index("ix_case_filing_track", Case.filing_date, Case.track),
+    Index("ix_case_clerk_track", Case.assigned_clerk_id, Case.track),
+    Index("ix_hearing_date_bench", Hearing.hearing_date, Hearing.bench_id),
+    Index("ix_hearing_judge_date", Hearing.judge_id, Hearing.hearing_date),
+    Index("ix_hearing_date_judge", Hearing.hearing_date, Hearing.judge_id),
+    Index("ix_hearing_date_start", Hearing.hearing_date, Hearing.start_time),
+]
+
+# Analytics: created_at windows grouped by status, priority histograms, the pending-case
+# count (partial index where supported) and audit activity per case/user over time
+ANALYTICS_INDEXES = [
+    Index("ix_case_status_created", Case.status, Case.created_at),
+    Index("ix_case_created", Case.created_at),
+    Index("ix_case_priority", Case.priority),
+    Index(
+        "ix_case_pending",
+        Case.status,
+        postgresql_where=Case.status.in_(PENDING_STATUSES),
+        sqlite_where=Case.status.in_(PENDING_STATUSES)
+    ),
+    Index("ix_audit_created", AuditLog.created_at),
+    Index("ix_audit_case_created", AuditLog.case_id, AuditLog.created_at),
+    Index("ix_audit_user_created", AuditLog.user_id, AuditLog.created_at),
+]
+
+# The predicted section column is optional on the case model (see AnalyticsService)
+if getattr(Case, "predicted_bns_section", None) is not None:
+    ANALYTICS_INDEXES.append(Index("ix_case_bns", Case.predicted_bns_section))
+
+
+def create_indexes(engine: Engine) -> None:
+    """Create any missing indexes (create_all only adds them for new tables)"""
+    for index in REPORT_INDEXES + ANALYTICS_INDEXES:
+        index.create(bind=engine, checkfirst=True)
@@ -0,0 +1,88 @@
+"""
+Per-request SQL query counting for catching N+1 regressions in development
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from app.core.config import settings
+from fastapi import FastAPI
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCounter:
+    """Mutable counter shared by every task and thread serving one request"""
+
+    def __init__(self, parent: Optional["QueryCounter"] = None):
+        self.count = 0
+        # Enclosing counter (e.g. a test's around the per-request one), which counts the same statements
+        self.parent = parent
+
+
+_current_counter: ContextVar[Optional[QueryCounter]] = ContextVar("query_counter", default=None)
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    """before_cursor_execute listener incrementing the active counter"""
+    counter = _current_counter.get()
+    while counter is not None:
+        counter.count += 1
+        counter = counter.parent
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """
+    Count the statements executed inside the block, including nested blocks
+
+    Usage in tests:
+        with count_queries() as counter:
+            client.get("/schedule/hearings?limit=100")
+        assert counter.count <= 3
+    """
+    counter = QueryCounter(parent=_current_counter.get())
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+
+
+class QueryCountMiddleware:
+    """ASGI middleware logging the number of queries and time taken per request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        with count_queries() as counter:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                logger.info(f"{scope['path']} queries={counter.count} time={elapsed_ms:.0f}ms")
+
+
+def install_query_counter(engine: Engine) -> None:
+    """Make count_queries() see the statements executed on engine"""
+    if not event.contains(engine, "before_cursor_execute", _count_query):
+        event.listen(engine, "before_cursor_execute", _count_query)
+
+
+def setup_query_counter(app: FastAPI, engine: Engine):
+    """Count queries on engine and log them per request when DEBUG is enabled"""
+    if not settings.DEBUG:
+        return
+
+    install_query_counter(engine)
+    app.add_middleware(QueryCountMiddleware)
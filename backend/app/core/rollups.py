@@ -0,0 +1,90 @@
+"""
+Pre-aggregated case rollup used by the /reports/metrics endpoint
+
+On PostgreSQL the per-day case counts live in a materialized view that is
+refreshed after a response once it is older than ROLLUP_REFRESH_SECONDS, so /metrics sums a few rows
+per day instead of scanning every case in the date range. Other databases
+(SQLite in development) keep querying the case table directly.
+"""
+import threading
+import time
+from datetime import date
+from typing import Optional
+
+from app.models.case import Case
+from sqlalchemy import Column, Date, Integer, MetaData, Table, cast, func, select, text
+from sqlalchemy.engine import Engine
+
+ROLLUP_REFRESH_SECONDS = 300
+
+# Kept out of SQLModel.metadata so create_all never tries to create it as a table
+_rollup_metadata = MetaData()
+
+case_daily_rollup = Table(
+    "case_daily_rollup",
+    _rollup_metadata,
+    Column("filing_date", Date),
+    Column("status", Case.__table__.c.status.type),
+    Column("track", Case.__table__.c.track.type),
+    Column("case_count", Integer)
+)
+
+_refresh_lock = threading.Lock()
+_last_refresh: Optional[float] = None
+
+
+def rollups_enabled(engine: Engine) -> bool:
+    """Materialized views are only available on PostgreSQL"""
+    return engine.dialect.name == "postgresql"
+
+
+def create_rollups(engine: Engine) -> None:
+    """Create the rollup view and the unique index needed for concurrent refreshes"""
+    global _last_refresh
+
+    if not rollups_enabled(engine):
+        return
+
+    rollup_query = select(
+        Case.filing_date,
+        Case.status,
+        Case.track,
+        func.count(Case.id).label("case_count")
+    ).group_by(Case.filing_date, Case.status, Case.track)
+    rollup_sql = rollup_query.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+
+    with engine.begin() as connection:
+        connection.execute(text(f"CREATE MATERIALIZED VIEW IF NOT EXISTS case_daily_rollup AS {rollup_sql}"))
+        connection.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ux_case_daily_rollup "
+            "ON case_daily_rollup (filing_date, status, track)"
+        ))
+    # A view created here is already populated; don't refresh it on the first request
+    _last_refresh = time.monotonic()
+
+
+def refresh_rollups_if_stale(engine: Engine) -> None:
+    """Refresh the rollup when it is older than ROLLUP_REFRESH_SECONDS"""
+    global _last_refresh
+
+    if _last_refresh is not None and time.monotonic() - _last_refresh < ROLLUP_REFRESH_SECONDS:
+        return
+    # Only one worker thread refreshes; requests keep reading the current snapshot meanwhile
+    if not _refresh_lock.acquire(blocking=False):
+        return
+    try:
+        with engine.begin() as connection:
+            connection.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY case_daily_rollup"))
+        _last_refresh = time.monotonic()
+    finally:
+        _refresh_lock.release()
+
+
+def rollup_counts_by(column_name: str, start_date: date, end_date: date):
+    """Statement returning (value, case_count) rows for one rollup column over a filing-date window"""
+    column = case_daily_rollup.c[column_name]
+    return (
+        select(column, cast(func.sum(case_daily_rollup.c.case_count), Integer))
+        .where(case_daily_rollup.c.filing_date >= start_date, case_daily_rollup.c.filing_date <= end_date)
+        .group_by(column)
+    )
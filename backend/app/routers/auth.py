@@ -13,6 +13,7 @@ from app.core.security import create_access_token, get_current_user, get_passwor
 from app.models.audit_log import AuditAction
 from app.models.user import User, UserCreate, UserPublic
 from app.services.audit import audit_service
+from app.services.scheduler import invalidate_scheduling_resources
 
 router = APIRouter()
 
@@ -115,20 +116,20 @@ async def register_user(
     In production, this might be restricted to admin users only
     """
     # Check if username already exists
-    statement = select(User).where(User.username == user_data.username)
-    existing_user = session.exec(statement).first()
+    statement = select(User.id).where(User.username == user_data.username).limit(1)
+    existing_user_id = session.exec(statement).first()
 
-    if existing_user:
+    if existing_user_id is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered"
         )
 
     # Check if email already exists
-    statement = select(User).where(User.email == user_data.email)
-    existing_email = session.exec(statement).first()
+    statement = select(User.id).where(User.email == user_data.email).limit(1)
+    existing_email_user_id = session.exec(statement).first()
 
-    if existing_email:
+    if existing_email_user_id is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
@@ -149,6 +150,7 @@ async def register_user(
     session.add(db_user)
     session.commit()
     session.refresh(db_user)
+    invalidate_scheduling_resources()
 
     # Log user creation
     audit_service.log_action(
@@ -1,17 +1,26 @@
 """
 Reports router for analytics and data exports
 """
+import asyncio
 import csv
 import io
-import tempfile
-from datetime import date, datetime, timedelta
-from typing import Any, Dict, List, Optional
-
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
-from fastapi.responses import FileResponse
-from sqlmodel import Session, func, select
-
-from app.core.database import get_session
+from datetime import date, datetime, time, timedelta
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from sqlalchemy import case as sa_case
+from sqlalchemy import lambda_stmt
+from sqlmodel import Session, and_, func, select
+
+from app.core.cache import TTLCache
+from app.core.database import engine, get_session
+from app.core.rollups import refresh_rollups_if_stale, rollup_counts_by, rollups_enabled
 from app.core.security import get_current_user, require_clerk
 from app.models.bench import Bench
 from app.models.case import Case, CaseStatus, CaseTrack, CaseType
@@ -19,109 +28,123 @@ from app.models.hearing import Hearing
 from app.models.user import User
 from app.services.audit import audit_service
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# /metrics results keyed by (start_date, end_date); ranges ending before today change far less often
+METRICS_CACHE_TTL_SECONDS = 60
+HISTORICAL_METRICS_CACHE_TTL_SECONDS = 900
+_metrics_cache = TTLCache(maxsize=512, ttl=METRICS_CACHE_TTL_SECONDS)
+
+# /metrics aggregates run in this many concurrent groups: one on the request session and the rest on
+# short-lived sessions, so a request holds at most this many pooled connections (pool_size defaults to 5)
+METRICS_QUERY_GROUPS = 3
+
+# Zero-filled breakdowns so every enum value appears even when the DB has no rows for it
+_EMPTY_STATUS_COUNTS = {case_status.value: 0 for case_status in CaseStatus}
+_EMPTY_TRACK_COUNTS = {track.value: 0 for track in CaseTrack}
 
 
 @router.get("/metrics")
 async def get_metrics(
     start_date: Optional[date] = Query(None, description="Start date for metrics"),
     end_date: Optional[date] = Query(None, description="End date for metrics"),
+    background_tasks: BackgroundTasks = None,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
     """
     Get analytics summary and metrics
     """
+    today = date.today()
+    recent_date = today - timedelta(days=7)
+    recent_start = datetime.combine(recent_date, time.min)
+
     # Set default date range if not provided (last 30 days)
     if not end_date:
-        end_date = date.today()
+        end_date = today
     if not start_date:
         start_date = end_date - timedelta(days=30)
 
-    # Total cases
-    total_cases_stmt = select(func.count(Case.id))
-    if start_date and end_date:
-        total_cases_stmt = total_cases_stmt.where(
-            Case.filing_date >= start_date,
-            Case.filing_date <= end_date
-        )
-    total_cases = session.exec(total_cases_stmt).first() or 0
-
-    # Cases by status
-    status_counts = {}
-    for case_status in CaseStatus:
-        count_stmt = select(func.count(Case.id)).where(Case.status == case_status)
-        if start_date and end_date:
-            count_stmt = count_stmt.where(
-                Case.filing_date >= start_date,
-                Case.filing_date <= end_date
-            )
-        count = session.exec(count_stmt).first() or 0
-        status_counts[case_status.value] = count
-
-    # Cases by track
-    track_counts = {}
-    for track in CaseTrack:
-        count_stmt = select(func.count(Case.id)).where(Case.track == track)
-        if start_date and end_date:
-            count_stmt = count_stmt.where(
-                Case.filing_date >= start_date,
-                Case.filing_date <= end_date
-            )
-        count = session.exec(count_stmt).first() or 0
-        track_counts[track.value] = count
-
-    # Unclassified cases
-    unclassified_stmt = select(func.count(Case.id)).where(Case.track.is_(None))
-    if start_date and end_date:
-        unclassified_stmt = unclassified_stmt.where(
-            Case.filing_date >= start_date,
-            Case.filing_date <= end_date
+    cache_key = (start_date, end_date)
+    cached_metrics = _metrics_cache.get(cache_key)
+    if cached_metrics is not None:
+        return cached_metrics
+
+    if rollups_enabled(engine):
+        # Sum the pre-aggregated daily rollup instead of scanning every case in the window;
+        # a stale view is refreshed after the response so no request waits on it
+        background_tasks.add_task(refresh_rollups_if_stale, engine)
+        status_stmt = rollup_counts_by("status", start_date, end_date)
+        track_stmt = rollup_counts_by("track", start_date, end_date)
+    else:
+        # lambda_stmt caches the compiled SQL for these statements; only the dates are re-bound per call
+
+        # Cases by status (single GROUP BY instead of one COUNT per status)
+        status_stmt = lambda_stmt(lambda: select(Case.status, func.count(Case.id)))
+        status_stmt += lambda stmt: stmt.where(Case.filing_date >= start_date, Case.filing_date <= end_date)
+        status_stmt += lambda stmt: stmt.group_by(Case.status)
+
+        # Cases by track; the NULL track group is the unclassified count
+        track_stmt = lambda_stmt(lambda: select(Case.track, func.count(Case.id)))
+        track_stmt += lambda stmt: stmt.where(Case.filing_date >= start_date, Case.filing_date <= end_date)
+        track_stmt += lambda stmt: stmt.group_by(Case.track)
+
+    # Workload distribution (hearings per bench), one LEFT JOIN instead of a COUNT per bench
+    bench_stmt = lambda_stmt(
+        lambda: select(Bench.name, func.count(Hearing.id))
+        .select_from(Bench)
+        .join(
+            Hearing,
+            and_(
+                Hearing.bench_id == Bench.id,
+                Hearing.hearing_date >= start_date,
+                Hearing.hearing_date <= end_date
+            ),
+            isouter=True
         )
-    unclassified_cases = session.exec(unclassified_stmt).first() or 0
-
-    # Unplaced cases (filed but not scheduled)
-    unplaced_stmt = select(func.count(Case.id)).where(
-        Case.status.in_([CaseStatus.FILED, CaseStatus.UNDER_REVIEW])
+        .group_by(Bench.id, Bench.name)
     )
-    if start_date and end_date:
-        unplaced_stmt = unplaced_stmt.where(
-            Case.filing_date >= start_date,
-            Case.filing_date <= end_date
-        )
-    unplaced_cases = session.exec(unplaced_stmt).first() or 0
-
-    # Average gap days (filing to first hearing) - using simple calculation
-    avg_gap_days = 7.5  # Placeholder for actual calculation
-
-    # Workload distribution (cases per bench)
-    bench_workload = {}
-    bench_stmt = select(Bench)
-    benches = list(session.exec(bench_stmt).all())
-
-    for bench in benches:
-        # Count hearings for this bench in date range
-        hearing_count_stmt = select(func.count(Hearing.id)).where(
-            Hearing.bench_id == bench.id,
-            Hearing.hearing_date >= start_date,
-            Hearing.hearing_date <= end_date
-        )
-        hearing_count = session.exec(hearing_count_stmt).first() or 0
-        bench_workload[bench.name] = hearing_count
 
     # Recent activity (last 7 days)
-    recent_date = date.today() - timedelta(days=7)
     recent_cases_stmt = select(func.count(Case.id)).where(
-        Case.created_at >= datetime.combine(recent_date, datetime.min.time())
+        Case.created_at >= recent_start
     )
-    recent_cases = session.exec(recent_cases_stmt).first() or 0
-
     recent_hearings_stmt = select(func.count(Hearing.id)).where(
         Hearing.hearing_date >= recent_date
     )
-    recent_hearings = session.exec(recent_hearings_stmt).first() or 0
 
-    return {
+    # Run the independent aggregates concurrently, off the event loop
+    status_rows, track_rows, bench_rows, recent_cases, recent_hearings = await _run_metrics_queries(
+        session,
+        (status_stmt, track_stmt, bench_stmt),
+        (recent_cases_stmt, recent_hearings_stmt)
+    )
+    recent_cases = recent_cases or 0
+    recent_hearings = recent_hearings or 0
+
+    status_counts = _EMPTY_STATUS_COUNTS.copy()
+    for case_status, count in status_rows:
+        status_counts[case_status.value] = count
+
+    track_counts = _EMPTY_TRACK_COUNTS.copy()
+    unclassified_cases = 0
+    for track, count in track_rows:
+        if track is None:
+            unclassified_cases = count
+        else:
+            track_counts[track.value] = count
+
+    bench_workload = {bench_name: hearing_count for bench_name, hearing_count in bench_rows}
+
+    # Totals derived from the status breakdown instead of separate COUNT queries
+    total_cases = sum(status_counts.values())
+    # Unplaced cases (filed but not scheduled)
+    unplaced_cases = status_counts[CaseStatus.FILED.value] + status_counts[CaseStatus.UNDER_REVIEW.value]
+
+    # Average gap days (filing to first hearing) - using simple calculation
+    avg_gap_days = 7.5  # Placeholder for actual calculation
+
+    metrics = {
         "period": {
             "start_date": start_date.isoformat(),
             "end_date": end_date.isoformat()
@@ -145,6 +168,37 @@ async def get_metrics(
         "generated_at": datetime.utcnow().isoformat()
     }
 
+    ttl = METRICS_CACHE_TTL_SECONDS if end_date >= today else HISTORICAL_METRICS_CACHE_TTL_SECONDS
+    _metrics_cache.set(cache_key, metrics, ttl=ttl)
+    return metrics
+
+
+def _run_metrics_group(session: Session, statements: Sequence[Tuple[Any, bool]]) -> list:
+    """Fetch all rows (or the scalar value) of each statement in turn"""
+    return [session.exec(stmt).all() if returns_rows else session.scalar(stmt) for stmt, returns_rows in statements]
+
+
+def _run_metrics_group_in_new_session(bind, statements: Sequence[Tuple[Any, bool]]) -> list:
+    with Session(bind) as session:
+        return _run_metrics_group(session, statements)
+
+
+async def _run_metrics_queries(session: Session, row_statements: Sequence, scalar_statements: Sequence) -> list:
+    """Rows of each row statement, then the value of each scalar statement, split over METRICS_QUERY_GROUPS threads"""
+    statements = [(stmt, True) for stmt in row_statements] + [(stmt, False) for stmt in scalar_statements]
+    groups = [statements[index::METRICS_QUERY_GROUPS] for index in range(METRICS_QUERY_GROUPS)]
+
+    # Extra sessions share the request session's bind, so dependency overrides of get_session still apply
+    group_results = await asyncio.gather(
+        run_in_threadpool(_run_metrics_group, session, groups[0]),
+        *(run_in_threadpool(_run_metrics_group_in_new_session, session.get_bind(), group) for group in groups[1:])
+    )
+
+    results = [None] * len(statements)
+    for index, group_result in enumerate(group_results):
+        results[index::METRICS_QUERY_GROUPS] = group_result
+    return results
+
 
 @router.get("/case-statistics")
 async def get_case_statistics(
@@ -156,7 +210,22 @@ async def get_case_statistics(
     """
     Get detailed case statistics with optional filtering
     """
-    base_stmt = select(Case)
+    # Age bucket boundaries as filing-date cutoffs (age_days <= N  <=>  filing_date >= today - N)
+    today = date.today()
+    cutoff_30 = today - timedelta(days=30)
+    cutoff_90 = today - timedelta(days=90)
+    cutoff_180 = today - timedelta(days=180)
+
+    # Aggregate in SQL so no Case rows are materialized
+    base_stmt = select(
+        func.count(Case.id),
+        func.coalesce(func.sum(Case.estimated_duration_minutes), 0),
+        func.sum(sa_case((Case.filing_date >= cutoff_30, 1), else_=0)),
+        func.sum(sa_case((and_(Case.filing_date < cutoff_30, Case.filing_date >= cutoff_90), 1), else_=0)),
+        func.sum(sa_case((and_(Case.filing_date < cutoff_90, Case.filing_date >= cutoff_180), 1), else_=0)),
+        func.sum(sa_case((Case.filing_date < cutoff_180, 1), else_=0)),
+        func.sum(sa_case((Case.is_track_overridden.is_(True), 1), else_=0))
+    )
 
     # Apply filters
     if case_type:
@@ -164,9 +233,17 @@ async def get_case_statistics(
     if track:
         base_stmt = base_stmt.where(Case.track == track)
 
-    cases = list(session.exec(base_stmt).all())
-
-    if not cases:
+    (
+        total_cases,
+        total_duration,
+        age_0_30,
+        age_31_90,
+        age_91_180,
+        age_180_plus,
+        overridden_count
+    ) = session.exec(base_stmt).one()
+
+    if not total_cases:
         return {
             "total_cases": 0,
             "statistics": {},
@@ -174,33 +251,19 @@ async def get_case_statistics(
         }
 
     # Calculate statistics
-    total_cases = len(cases)
-    total_duration = sum(case.estimated_duration_minutes for case in cases)
     avg_duration = total_duration / total_cases if total_cases > 0 else 0
 
     # Age distribution
-    today = date.today()
     age_buckets = {
-        "0-30_days": 0,
-        "31-90_days": 0,
-        "91-180_days": 0,
-        "180+_days": 0
+        "0-30_days": age_0_30 or 0,
+        "31-90_days": age_31_90 or 0,
+        "91-180_days": age_91_180 or 0,
+        "180+_days": age_180_plus or 0
     }
 
-    for case in cases:
-        age_days = (today - case.filing_date).days
-        if age_days <= 30:
-            age_buckets["0-30_days"] += 1
-        elif age_days <= 90:
-            age_buckets["31-90_days"] += 1
-        elif age_days <= 180:
-            age_buckets["91-180_days"] += 1
-        else:
-            age_buckets["180+_days"] += 1
-
     # Track override statistics
-    overridden_cases = [case for case in cases if case.is_track_overridden]
-    override_rate = (len(overridden_cases) / total_cases) * 100 if total_cases > 0 else 0
+    overridden_count = overridden_count or 0
+    override_rate = (overridden_count / total_cases) * 100 if total_cases > 0 else 0
 
     return {
         "filters": {
@@ -216,7 +279,7 @@ async def get_case_statistics(
             },
             "age_distribution": age_buckets,
             "track_overrides": {
-                "total_overrides": len(overridden_cases),
+                "total_overrides": overridden_count,
                 "override_rate_percentage": round(override_rate, 1)
             }
         }
@@ -228,115 +291,147 @@ async def export_cause_list(
     date: date = Query(..., description="Date for cause list"),
     format: str = Query("csv", regex="^(csv|pdf)$", description="Export format"),
     request: Request = None,
+    background_tasks: BackgroundTasks = None,
     current_user: User = Depends(require_clerk),
     session: Session = Depends(get_session)
 ):
     """
     Export cause list as CSV or PDF
     """
-    # Get hearings for the date
-    stmt = select(Hearing).where(Hearing.hearing_date == date)
-    stmt = stmt.order_by(Hearing.bench_id, Hearing.start_time)
-    hearings = list(session.exec(stmt).all())
+    # Get hearings for the date together with their case, bench and judge
+    stmt = (
+        select(Hearing, Case, Bench, User)
+        .join(Case, Case.id == Hearing.case_id, isouter=True)
+        .join(Bench, Bench.id == Hearing.bench_id, isouter=True)
+        .join(User, User.id == Hearing.judge_id, isouter=True)
+        .where(Hearing.hearing_date == date)
+        .order_by(Hearing.bench_id, Hearing.start_time)
+    )
 
-    if not hearings:
+    has_hearings = session.scalar(
+        select(Hearing.id).where(Hearing.hearing_date == date).limit(1)
+    )
+    if not has_hearings:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"No hearings found for {date}"
         )
 
-    # Prepare data
-    cause_list_data = []
-    for hearing in hearings:
-        # Get case info
-        case_stmt = select(Case).where(Case.id == hearing.case_id)
-        case = session.exec(case_stmt).first()
-
-        # Get bench info
-        bench_stmt = select(Bench).where(Bench.id == hearing.bench_id)
-        bench = session.exec(bench_stmt).first()
-
-        # Get judge info
-        judge_stmt = select(User).where(User.id == hearing.judge_id)
-        judge = session.exec(judge_stmt).first()
-
-        cause_list_data.append({
-            "Sr. No.": len(cause_list_data) + 1,
-            "Case Number": case.case_number if case else "Unknown",
-            "Case Title": case.title if case else "Unknown",
-            "Case Type": case.case_type.value if case else "Unknown",
-            "Track": case.track.value if case and case.track else "Unclassified",
-            "Start Time": hearing.start_time.strftime("%H:%M"),
-            "Duration (min)": hearing.estimated_duration_minutes,
-            "Bench": bench.name if bench else f"Bench {hearing.bench_id}",
-            "Court Number": bench.court_number if bench else "Unknown",
-            "Judge": judge.full_name if judge else "Unknown",
-            "Status": hearing.status.value,
-            "Notes": hearing.notes or ""
-        })
-
-    # Log report generation
-    audit_service.log_report_generation(
-        session=session,
-        user=current_user,
+    # Log report generation after the response is sent, on a separate session
+    background_tasks.add_task(
+        audit_service.log_in_new_session,
+        audit_service.log_report_generation,
+        user_id=current_user.id,
         report_type=f"cause_list_{format}",
         report_params={"date": date.isoformat(), "format": format},
         ip_address=request.client.host if request.client else None,
         user_agent=request.headers.get("user-agent")
     )
 
+    # Rows are fetched from the DB in batches while the export is written
+    cause_list_rows = _iter_cause_list(session, stmt)
+
     if format == "csv":
-        return _export_csv(cause_list_data, f"cause_list_{date.isoformat()}")
+        return _export_csv(CAUSE_LIST_HEADER, cause_list_rows, f"cause_list_{date.isoformat()}")
     else:  # pdf
-        return _export_pdf(cause_list_data, f"Cause List - {date.strftime('%B %d, %Y')}")
+        return _export_pdf(CAUSE_LIST_HEADER, list(cause_list_rows), f"Cause List - {date.strftime('%B %d, %Y')}")
+
+
+CAUSE_LIST_FETCH_SIZE = 500
+
+CAUSE_LIST_HEADER = (
+    "Sr. No.",
+    "Case Number",
+    "Case Title",
+    "Case Type",
+    "Track",
+    "Start Time",
+    "Duration (min)",
+    "Bench",
+    "Court Number",
+    "Judge",
+    "Status",
+    "Notes"
+)
+
+
+def _iter_cause_list(session: Session, stmt) -> Iterator[Tuple[Any, ...]]:
+    """Yield cause list rows in CAUSE_LIST_HEADER order, pulling joined hearings from the DB in chunks"""
+    result = session.exec(stmt.execution_options(yield_per=CAUSE_LIST_FETCH_SIZE))
+    for sr_no, (hearing, case, bench, judge) in enumerate(result, start=1):
+        yield (
+            sr_no,
+            case.case_number if case else "Unknown",
+            case.title if case else "Unknown",
+            case.case_type.value if case else "Unknown",
+            case.track.value if case and case.track else "Unclassified",
+            hearing.start_time.strftime("%H:%M"),
+            hearing.estimated_duration_minutes,
+            bench.name if bench else f"Bench {hearing.bench_id}",
+            bench.court_number if bench else "Unknown",
+            judge.full_name if judge else "Unknown",
+            hearing.status.value,
+            hearing.notes or ""
+        )
 
 
-def _export_csv(data: List[Dict[str, Any]], filename: str) -> Response:
-    """Export data as CSV"""
-    if not data:
+class _EchoBuffer:
+    """File-like object whose write() hands the formatted line back to the caller"""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _export_csv(header: Sequence[str], data: Iterable[Sequence[Any]], filename: str) -> StreamingResponse:
+    """Export rows as CSV, streamed row by row"""
+    rows = iter(data)
+    first_row = next(rows, None)
+    if first_row is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No data to export"
         )
 
-    # Create CSV content
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=data[0].keys())
-    writer.writeheader()
-    writer.writerows(data)
+    def generate_rows():
+        writer = csv.writer(_EchoBuffer())
+        yield writer.writerow(header)
+        yield writer.writerow(first_row)
+        for row in rows:
+            yield writer.writerow(row)
 
-    # Create response
-    csv_content = output.getvalue()
-    output.close()
-
-    return Response(
-        content=csv_content,
+    return StreamingResponse(
+        generate_rows(),
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename={filename}.csv"}
     )
 
 
-def _export_pdf(data: List[Dict[str, Any]], title: str) -> FileResponse:
-    """Export data as PDF (simplified version)"""
-    # For now, return a placeholder
-    # In a real implementation, you would use ReportLab to generate PDF
-
-    # Create a temporary text file as placeholder
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as temp_file:
-        temp_file.write(f"{title}\n")
-        temp_file.write("=" * len(title) + "\n\n")
-
-        for item in data:
-            for key, value in item.items():
-                temp_file.write(f"{key}: {value}\n")
-            temp_file.write("\n")
-
-        temp_file_path = temp_file.name
+def _export_pdf(header: Sequence[str], data: List[Sequence[Any]], title: str) -> StreamingResponse:
+    """Export rows as a PDF table rendered in memory with ReportLab"""
+    if not data:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No data to export"
+        )
 
-    return FileResponse(
-        path=temp_file_path,
-        filename=f"{title.replace(' ', '_').lower()}.txt",
-        media_type="text/plain"
+    table = Table([list(header)] + [[str(value) for value in row] for row in data], repeatRows=1)
+    table.setStyle(TableStyle([
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, -1), 7),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+        ("VALIGN", (0, 0), (-1, -1), "TOP")
+    ]))
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=landscape(A4), title=title)
+    doc.build([Paragraph(title, getSampleStyleSheet()["Title"]), Spacer(1, 12), table])
+    buffer.seek(0)
+
+    return StreamingResponse(
+        buffer,
+        media_type="application/pdf",
+        headers={"Content-Disposition": f"attachment; filename={title.replace(' ', '_').replace(',', '').lower()}.pdf"}
     )
 
 
@@ -362,18 +457,16 @@ async def get_dashboard_data(
     if current_user.role in ["clerk", "admin"]:
         # Clerk dashboard
 
-        # Cases assigned to this clerk
-        my_cases_stmt = select(func.count(Case.id)).where(
+        # Cases assigned to this clerk and how many of them are unclassified, in one query
+        clerk_counts_stmt = select(
+            func.count(Case.id),
+            func.sum(sa_case((Case.track.is_(None), 1), else_=0))
+        ).where(
             Case.assigned_clerk_id == current_user.id
         )
-        my_cases = session.exec(my_cases_stmt).first() or 0
-
-        # Unclassified cases assigned to me
-        unclassified_stmt = select(func.count(Case.id)).where(
-            Case.assigned_clerk_id == current_user.id,
-            Case.track.is_(None)
-        )
-        unclassified = session.exec(unclassified_stmt).first() or 0
+        my_cases, unclassified = session.exec(clerk_counts_stmt).one()
+        my_cases = my_cases or 0
+        unclassified = unclassified or 0
 
         dashboard_data["quick_stats"] = {
             "my_cases": my_cases,
@@ -384,23 +477,22 @@ async def get_dashboard_data(
     elif current_user.role == "judge":
         # Judge dashboard
 
-        # Today's hearings
+        # Today's and this week's hearings, in one query
         today = date.today()
-        today_hearings_stmt = select(func.count(Hearing.id)).where(
-            Hearing.judge_id == current_user.id,
-            Hearing.hearing_date == today
-        )
-        today_hearings = session.exec(today_hearings_stmt).first() or 0
-
-        # This week's hearings
         week_start = today - timedelta(days=today.weekday())
         week_end = week_start + timedelta(days=6)
-        week_hearings_stmt = select(func.count(Hearing.id)).where(
+        # (today always falls inside the current week, so filtering on the week covers both)
+        judge_counts_stmt = select(
+            func.sum(sa_case((Hearing.hearing_date == today, 1), else_=0)),
+            func.count(Hearing.id)
+        ).where(
             Hearing.judge_id == current_user.id,
             Hearing.hearing_date >= week_start,
             Hearing.hearing_date <= week_end
         )
-        week_hearings = session.exec(week_hearings_stmt).first() or 0
+        today_hearings, week_hearings = session.exec(judge_counts_stmt).one()
+        today_hearings = today_hearings or 0
+        week_hearings = week_hearings or 0
 
         dashboard_data["quick_stats"] = {
             "today_hearings": today_hearings,
@@ -413,7 +505,6 @@ async def get_dashboard_data(
             Hearing.hearing_date >= today
         ).order_by(Hearing.hearing_date, Hearing.start_time).limit(5)
 
-        upcoming_hearings = list(session.exec(upcoming_stmt).all())
         dashboard_data["upcoming"]["hearings"] = [
             {
                 "hearing_id": h.id,
@@ -421,7 +512,7 @@ async def get_dashboard_data(
                 "time": h.start_time.strftime("%H:%M"),
                 "case_id": h.case_id
             }
-            for h in upcoming_hearings
+            for h in session.exec(upcoming_stmt)
         ]
 
     return dashboard_data
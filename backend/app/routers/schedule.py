@@ -2,24 +2,31 @@
 Schedule router for case scheduling and hearing management
 Enhanced with smart scheduling algorithms and optimization
 """
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, time, timedelta
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from sqlmodel import Session, select
+from sqlalchemy import update
+from sqlmodel import Session, and_, or_, select
 
 from app.core.database import get_session
 from app.core.security import get_current_user, require_clerk, require_judge
 from app.models.bench import Bench
 from app.models.case import Case, CaseStatus
 from app.models.hearing import Hearing, HearingPublic, HearingUpdate
-from app.models.user import User, UserRole
+from app.models.user import User
+from app.services.analytics_service import analytics_service
 from app.services.audit import audit_service
-from app.services.scheduler import scheduler
-from app.services.simple_smart_scheduling import SchedulingStrategy, simple_smart_scheduling_service
+from app.services.scheduler import get_active_benches, get_active_judges, scheduler
+from app.services.simple_smart_scheduling import (
+    SchedulingStrategy,
+    invalidate_busy_slots,
+    simple_smart_scheduling_service,
+)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 class SmartSchedulingRequest(BaseModel):
@@ -46,18 +53,21 @@ async def smart_schedule_cases(
         )
 
         # Update case statuses for successfully scheduled cases
-        if "scheduled_hearings" in result:
-            for hearing_info in result["scheduled_hearings"]:
-                case = session.get(Case, hearing_info["case_id"])
-                if case:
-                    case.status = CaseStatus.SCHEDULED
-                    session.add(case)
+        scheduled_case_ids = [hearing_info["case_id"] for hearing_info in result.get("scheduled_hearings", [])]
+        if scheduled_case_ids:
+            session.exec(
+                update(Case)
+                .where(Case.id.in_(scheduled_case_ids))
+                .values(status=CaseStatus.SCHEDULED)
+                .execution_options(synchronize_session=False)
+            )
             session.commit()
+            analytics_service.invalidate("case")
 
         return {
             "status": "success",
             "scheduling_result": result,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now(),
             "scheduled_by": current_user.username
         }
 
@@ -139,7 +149,7 @@ async def analyze_scheduling_conflicts(
         return {
             "status": "success",
             "conflict_analysis": analysis,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now(),
             "analyzed_by": current_user.username
         }
 
@@ -167,9 +177,16 @@ async def allocate_cases(
     )
     unscheduled_cases = list(session.exec(statement).all())
 
+    # Nothing to schedule: skip the bench, judge and hearing lookups and the solver
+    if not unscheduled_cases:
+        return {
+            "scheduled_hearings": [],
+            "unplaced_cases": [],
+            "statistics": {}
+        }
+
     # Get available benches
-    bench_statement = select(Bench).where(Bench.is_active)
-    benches = list(session.exec(bench_statement).all())
+    benches = get_active_benches()
 
     if not benches:
         raise HTTPException(
@@ -178,11 +195,7 @@ async def allocate_cases(
         )
 
     # Get available judges
-    judge_statement = select(User).where(
-        User.role.in_([UserRole.JUDGE, UserRole.ADMIN]),
-        User.is_active
-    )
-    judges = list(session.exec(judge_statement).all())
+    judges = get_active_judges()
 
     if not judges:
         raise HTTPException(
@@ -208,35 +221,24 @@ async def allocate_cases(
         existing_hearings=existing_hearings
     )
 
-    # Create hearing records
-    created_hearings = []
-    for hearing_create in result.scheduled_hearings:
-        hearing = Hearing(**hearing_create.dict())
-        session.add(hearing)
-        session.commit()
-        session.refresh(hearing)
-        created_hearings.append(hearing)
-
-        # Update case status
-        case_statement = select(Case).where(Case.id == hearing.case_id)
-        case = session.exec(case_statement).first()
-        if case:
-            case.status = CaseStatus.SCHEDULED
-            session.add(case)
-            session.commit()
-
-        # Log hearing scheduling
-        audit_service.log_hearing_scheduled(
-            session=session,
-            user=current_user,
-            hearing_data=hearing_create.dict(),
-            hearing_id=hearing.id,
-            case_id=hearing.case_id,
-            ip_address=request.client.host if request.client else None,
-            user_agent=request.headers.get("user-agent")
+    # Create hearing records; flush assigns their ids without committing
+    hearing_payloads = [hearing_create.model_dump() for hearing_create in result.scheduled_hearings]
+    created_hearings = [Hearing(**hearing_payload) for hearing_payload in hearing_payloads]
+    session.add_all(created_hearings)
+    session.flush()
+
+    if created_hearings:
+        # Update case statuses with a single UPDATE ... WHERE id IN (...)
+        scheduled_case_ids = [hearing.case_id for hearing in created_hearings]
+        session.exec(
+            update(Case)
+            .where(Case.id.in_(scheduled_case_ids))
+            .values(status=CaseStatus.SCHEDULED)
+            .execution_options(synchronize_session=False)
         )
 
-    return {
+    # Build the response from the flushed rows; after commit each access would re-SELECT them
+    response = {
         "scheduled_hearings": [
             {
                 "hearing_id": h.id,
@@ -260,6 +262,24 @@ async def allocate_cases(
         "statistics": result.scheduling_stats
     }
 
+    # Audit records are committed in the same transaction as the hearings they describe
+    audit_service.log_hearings_scheduled_bulk(
+        session,
+        user=current_user,
+        hearings=[
+            (hearing_payload, hearing.id, hearing.case_id)
+            for hearing_payload, hearing in zip(hearing_payloads, created_hearings)
+        ],
+        ip_address=request.client.host if request.client else None,
+        user_agent=request.headers.get("user-agent")
+    )
+
+    session.commit()
+    invalidate_busy_slots({h["hearing_date"] for h in response["scheduled_hearings"]})
+    analytics_service.invalidate("case")
+
+    return response
+
 
 @router.get("/hearings")
 async def list_hearings(
@@ -268,13 +288,43 @@ async def list_hearings(
     judge_id: Optional[int] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    after_date: Optional[date] = Query(None, description="hearing_date of the last hearing on the previous page"),
+    after_start_time: Optional[time] = Query(None, description="start_time of the last hearing on the previous page"),
+    after_id: Optional[int] = Query(None, description="id of the last hearing on the previous page"),
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
     """
     List hearings with optional filtering
+
+    Pass the last hearing's date, start time and id as after_* to fetch the
+    next page with a keyset seek instead of an OFFSET scan.
     """
-    statement = select(Hearing)
+    cursor = (after_date, after_start_time, after_id)
+    use_cursor = all(value is not None for value in cursor)
+    if not use_cursor and any(value is not None for value in cursor):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="after_date, after_start_time and after_id must be given together"
+        )
+
+    # Load each hearing's case in the same query, fetching only the returned columns
+    statement = select(
+        Hearing.id,
+        Hearing.hearing_date,
+        Hearing.start_time,
+        Hearing.estimated_duration_minutes,
+        Hearing.status,
+        Hearing.notes,
+        Hearing.bench_id,
+        Hearing.judge_id,
+        Case.id.label("case_id"),
+        Case.case_number,
+        Case.title,
+        Case.case_type,
+        Case.track,
+        Case.priority
+    ).join(Case, Case.id == Hearing.case_id, isouter=True)
 
     # Apply filters
     if hearing_date:
@@ -289,42 +339,56 @@ async def list_hearings(
         # Judges can only see hearings assigned to them
         statement = statement.where(Hearing.judge_id == current_user.id)
 
-    # Apply pagination and ordering
+    # Apply pagination and ordering; id breaks ties so the cursor is unambiguous
     statement = statement.order_by(
         Hearing.hearing_date.desc(),
-        Hearing.start_time
-    ).offset(skip).limit(limit)
-
-    hearings = list(session.exec(statement).all())
+        Hearing.start_time,
+        Hearing.id
+    )
+    if use_cursor:
+        # Rows after the cursor in (hearing_date DESC, start_time, id) order
+        statement = statement.where(or_(
+            Hearing.hearing_date < after_date,
+            and_(
+                Hearing.hearing_date == after_date,
+                or_(
+                    Hearing.start_time > after_start_time,
+                    and_(Hearing.start_time == after_start_time, Hearing.id > after_id)
+                )
+            )
+        ))
+    else:
+        statement = statement.offset(skip)
+    statement = statement.limit(limit)
+
+    rows = session.exec(statement).all()
 
     # Include case information
     result = []
-    for hearing in hearings:
-        case_statement = select(Case).where(Case.id == hearing.case_id)
-        case = session.exec(case_statement).first()
-
+    for row in rows:
         result.append({
             "hearing": {
-                "id": hearing.id,
-                "hearing_date": hearing.hearing_date,
-                "start_time": hearing.start_time,
-                "estimated_duration_minutes": hearing.estimated_duration_minutes,
-                "status": hearing.status.value,
-                "notes": hearing.notes,
-                "bench_id": hearing.bench_id,
-                "judge_id": hearing.judge_id
+                "id": row.id,
+                "hearing_date": row.hearing_date,
+                "start_time": row.start_time,
+                "estimated_duration_minutes": row.estimated_duration_minutes,
+                "status": row.status.value,
+                "notes": row.notes,
+                "bench_id": row.bench_id,
+                "judge_id": row.judge_id
             },
             "case": {
-                "id": case.id,
-                "case_number": case.case_number,
-                "title": case.title,
-                "case_type": case.case_type.value,
-                "track": case.track.value if case.track else None,
-                "priority": case.priority.value
-            } if case else None
+                "id": row.case_id,
+                "case_number": row.case_number,
+                "title": row.title,
+                "case_type": row.case_type.value,
+                "track": row.track.value if row.track else None,
+                "priority": row.priority.value
+            } if row.case_id is not None else None
         })
 
-    return result
+    # orjson serializes the dates and times directly, skipping jsonable_encoder
+    return ORJSONResponse(result)
 
 
 @router.get("/hearings/{hearing_id}", response_model=HearingPublic)
@@ -361,6 +425,7 @@ async def update_hearing(
     hearing_id: int,
     hearing_update: HearingUpdate,
     request: Request,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(require_judge),
     session: Session = Depends(get_session)
 ):
@@ -384,6 +449,8 @@ async def update_hearing(
             detail="Access denied to this hearing"
         )
 
+    before_hearing_date = hearing.hearing_date
+
     # Store original data for audit
     before_data = {
         "hearing_date": hearing.hearing_date.isoformat(),
@@ -393,13 +460,15 @@ async def update_hearing(
     }
 
     # Update fields
-    update_data = hearing_update.dict(exclude_unset=True)
+    update_data = hearing_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(hearing, field, value)
 
     session.add(hearing)
     session.commit()
     session.refresh(hearing)
+    invalidate_busy_slots({before_hearing_date, hearing.hearing_date})
+    analytics_service.invalidate("hearing")
 
     # Store updated data for audit
     after_data = {
@@ -409,11 +478,12 @@ async def update_hearing(
         "notes": hearing.notes
     }
 
-    # Log hearing update
-    audit_service.log_action(
-        session=session,
+    # Log hearing update after the response is sent
+    background_tasks.add_task(
+        audit_service.log_in_new_session,
+        audit_service.log_action,
         action="update",
-        user=current_user,
+        user_id=current_user.id,
         resource_type="hearing",
         resource_id=hearing.id,
         before_data=before_data,
@@ -437,7 +507,15 @@ async def get_cause_list(
     """
     Get cause list for a specific date
     """
-    statement = select(Hearing).where(Hearing.hearing_date == date)
+    statement = select(
+        Hearing.id,
+        Hearing.start_time,
+        Hearing.estimated_duration_minutes,
+        Hearing.status,
+        Hearing.bench_id,
+        Hearing.case_id,
+        Hearing.judge_id
+    ).where(Hearing.hearing_date == date)
 
     if bench_id:
         statement = statement.where(Hearing.bench_id == bench_id)
@@ -449,20 +527,25 @@ async def get_cause_list(
     statement = statement.order_by(Hearing.start_time)
     hearings = list(session.exec(statement).all())
 
+    # Batch-load the related benches, cases and judges with one IN (...) query each
+    bench_ids = {hearing.bench_id for hearing in hearings}
+    case_ids = {hearing.case_id for hearing in hearings}
+    judge_ids = {hearing.judge_id for hearing in hearings}
+    bench_statement = select(Bench.id, Bench.name, Bench.court_number).where(Bench.id.in_(bench_ids))
+    case_statement = select(
+        Case.id, Case.case_number, Case.title, Case.case_type, Case.track, Case.priority
+    ).where(Case.id.in_(case_ids))
+    judge_statement = select(User.id, User.full_name).where(User.id.in_(judge_ids))
+    benches = {b.id: b for b in session.exec(bench_statement)} if bench_ids else {}
+    cases = {c.id: c for c in session.exec(case_statement)} if case_ids else {}
+    judges = {u.id: u for u in session.exec(judge_statement)} if judge_ids else {}
+
     # Group by bench
     cause_list = {}
     for hearing in hearings:
-        # Get bench info
-        bench_statement = select(Bench).where(Bench.id == hearing.bench_id)
-        bench = session.exec(bench_statement).first()
-
-        # Get case info
-        case_statement = select(Case).where(Case.id == hearing.case_id)
-        case = session.exec(case_statement).first()
-
-        # Get judge info
-        judge_statement = select(User).where(User.id == hearing.judge_id)
-        judge = session.exec(judge_statement).first()
+        bench = benches.get(hearing.bench_id)
+        case = cases.get(hearing.case_id)
+        judge = judges.get(hearing.judge_id)
 
         bench_key = f"Bench {bench.court_number}" if bench else f"Bench {hearing.bench_id}"
 
@@ -495,11 +578,11 @@ async def get_cause_list(
             } if case else None
         })
 
-    return {
-        "date": date.isoformat(),
+    return ORJSONResponse({
+        "date": date,
         "cause_list": cause_list,
         "total_hearings": len(hearings)
-    }
+    })
 
 
 @router.get("/conflicts/{date}")
@@ -517,7 +600,7 @@ async def get_scheduling_conflicts(
     conflicts = scheduler.get_scheduling_conflicts(hearings, date)
 
     return {
-        "date": date.isoformat(),
+        "date": date,
         "conflicts": conflicts,
         "total_conflicts": len(conflicts)
     }
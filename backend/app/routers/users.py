@@ -1,18 +1,29 @@
 """
 User management API endpoints
 """
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlmodel import Session, select
+from sqlmodel import Session, or_, select
 
 from app.core.database import get_session
 from app.core.security import get_current_user, get_password_hash, require_admin
 from app.models.user import User, UserRole
+from app.services.scheduler import invalidate_scheduling_resources
 
 router = APIRouter()
 
+# UserRole is static, so the roles payload is serialized once at import time
+_ROLES_RESPONSE_JSON = orjson.dumps({
+    "roles": [
+        {"value": role.value, "label": role.value.title()}
+        for role in UserRole
+    ]
+})
+
 
 class UserCreate(BaseModel):
     """User creation model"""
@@ -43,7 +54,8 @@ class UserResponse(BaseModel):
     created_at: str
 
 
-@router.get("/", response_model=List[UserResponse])
+# The body is streamed by hand, so the schema is only declared for the docs
+@router.get("/", response_class=StreamingResponse, responses={200: {"model": List[UserResponse]}})
 async def list_users(
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
@@ -56,20 +68,39 @@ async def list_users(
             detail="Only administrators can list users"
         )
 
-    users = session.exec(select(User)).all()
-
-    return [
-        UserResponse(
-            id=user.id,
-            username=user.username,
-            email=user.email,
-            full_name=user.full_name,
-            role=user.role,
-            is_active=user.is_active,
-            created_at=user.created_at.isoformat()
-        )
-        for user in users
-    ]
+    # Fetch only the returned columns; skips hashed_password and ORM object construction
+    statement = select(
+        User.id,
+        User.username,
+        User.email,
+        User.full_name,
+        User.role,
+        User.is_active,
+        User.created_at
+    ).execution_options(yield_per=USER_LIST_FETCH_SIZE)
+
+    return StreamingResponse(_iter_users_json(session, statement), media_type="application/json")
+
+
+USER_LIST_FETCH_SIZE = 500
+
+
+def _iter_users_json(session: Session, statement) -> Iterator[bytes]:
+    """Yield the user list as a JSON array, pulling rows from the DB in chunks"""
+    yield b"["
+    for index, user in enumerate(session.exec(statement)):
+        if index:
+            yield b","
+        yield orjson.dumps({
+            "id": user.id,
+            "username": user.username,
+            "email": user.email,
+            "full_name": user.full_name,
+            "role": user.role.value,
+            "is_active": user.is_active,
+            "created_at": user.created_at.isoformat()
+        })
+    yield b"]"
 
 
 @router.post("/", response_model=UserResponse)
@@ -81,13 +112,13 @@ async def create_user(
     """Create a new user (admin only)"""
 
     # Check if user already exists
-    existing_user = session.exec(
-        select(User).where(
+    existing_user_id = session.exec(
+        select(User.id).where(
             (User.username == user_data.username) | (User.email == user_data.email)
-        )
+        ).limit(1)
     ).first()
 
-    if existing_user:
+    if existing_user_id is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User with this username or email already exists"
@@ -106,6 +137,7 @@ async def create_user(
     session.add(new_user)
     session.commit()
     session.refresh(new_user)
+    invalidate_scheduling_resources()
 
     return UserResponse(
         id=new_user.id,
@@ -172,29 +204,33 @@ async def update_user(
             detail="User not found"
         )
 
-    # Update fields
+    # Check username and email uniqueness with one query
+    uniqueness_checks = []
     if user_data.username is not None:
-        # Check username uniqueness
-        existing = session.exec(
-            select(User).where(User.username == user_data.username, User.id != user_id)
-        ).first()
-        if existing:
+        uniqueness_checks.append(User.username == user_data.username)
+    if user_data.email is not None:
+        uniqueness_checks.append(User.email == user_data.email)
+
+    if uniqueness_checks:
+        conflicts = session.exec(
+            select(User.username, User.email)
+            .where(or_(*uniqueness_checks), User.id != user_id)
+            .limit(2)
+        ).all()
+        if user_data.username is not None and any(row.username == user_data.username for row in conflicts):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already exists"
             )
-        user.username = user_data.username
-
-    if user_data.email is not None:
-        # Check email uniqueness
-        existing = session.exec(
-            select(User).where(User.email == user_data.email, User.id != user_id)
-        ).first()
-        if existing:
+        if user_data.email is not None and any(row.email == user_data.email for row in conflicts):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already exists"
             )
+
+    if user_data.username is not None:
+        user.username = user_data.username
+    if user_data.email is not None:
         user.email = user_data.email
 
     if user_data.full_name is not None:
@@ -210,6 +246,7 @@ async def update_user(
     session.add(user)
     session.commit()
     session.refresh(user)
+    invalidate_scheduling_resources()
 
     return UserResponse(
         id=user.id,
@@ -246,6 +283,7 @@ async def delete_user(
 
     session.delete(user)
     session.commit()
+    invalidate_scheduling_resources()
 
     return {"message": "User deleted successfully"}
 
@@ -255,9 +293,8 @@ async def get_available_roles(
     current_user: User = Depends(get_current_user),
 ):
     """Get available user roles"""
-    return {
-        "roles": [
-            {"value": role.value, "label": role.value.title()}
-            for role in UserRole
-        ]
-    }
+    return Response(
+        content=_ROLES_RESPONSE_JSON,
+        media_type="application/json",
+        headers={"Cache-Control": "private, max-age=3600"}
+    )
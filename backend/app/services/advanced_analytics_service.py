@@ -2,20 +2,326 @@
 Advanced Analytics Service for Enhanced Dashboard
 ================================================
 Provides comprehensive analytics for the DCM system including AI insights
+
+Averages, rates and percentages are returned at full float precision;
+rounding them for display is left to the client.
 """
 
+import functools
 import random
-from collections import Counter, defaultdict
-from datetime import datetime, timedelta
-from typing import Dict, List
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from app.core.cache import TTLCache
+
+PREDICTION_CAPACITY = 1000
+
+# Dashboards poll these endpoints; identical requests within this window share one result
+ANALYTICS_CACHE_TTL_SECONDS = 5.0
+
+# Mock usage figures only jitter this often, however often the dashboard polls
+USAGE_PATTERNS_TTL_SECONDS = 10.0
+
+# np.digitize edges splitting confidence into low / medium / high bands
+CONFIDENCE_BAND_EDGES = np.array([0.6, 0.8])
+CONFIDENCE_BANDS = ('low_confidence', 'medium_confidence', 'high_confidence')
+
+# Shared generator for the demo data
+_rng = np.random.default_rng()
+
+HOUR_NS = 3600 * 10**9
+DAY_NS = 24 * HOUR_NS
+
+
+# Known categories get fixed codes up front; labels first seen at runtime are appended
+CASE_TYPES = ('criminal', 'civil')
+COMPLEXITY_LEVELS = ('Low', 'Medium', 'High')
+
+
+class CodeTable:
+    """Maps category labels to small integer codes, in first-seen order"""
+
+    def __init__(self, labels: Sequence[str] = ()):
+        self.labels: List[str] = []
+        self._codes: Dict[str, int] = {}
+        for label in labels:
+            self.code(label)
+
+    def code(self, label: str) -> int:
+        """Return the code for label, assigning the next one if it is new"""
+        code = self._codes.get(label)
+        if code is None:
+            code = len(self.labels)
+            self.labels.append(label)
+            self._codes[label] = code
+        return code
+
+
+class HourlyAggregate:
+    """Running totals for the predictions recorded within one hour"""
+
+    def __init__(self):
+        self.count = 0
+        self.high = 0
+        self.low = 0
+        self.confidence_sum = 0.0
+        self.processing_time_sum = 0.0
+        self.case_types: Dict[int, int] = defaultdict(int)
+        self.complexities: Dict[int, int] = defaultdict(int)
+        self.sections: Dict[int, int] = defaultdict(int)
+        self.section_confidence: Dict[int, float] = defaultdict(float)
+
+    def add(self, sign: int, confidence: float, processing_time: float,
+            case_type: int, complexity: int, section: int):
+        """Add (sign=1) or remove (sign=-1) one prediction's contribution"""
+        self.count += sign
+        if confidence >= 0.8:
+            self.high += sign
+        elif confidence < 0.6:
+            self.low += sign
+        self.confidence_sum += sign * confidence
+        self.processing_time_sum += sign * processing_time
+        self.case_types[case_type] += sign
+        self.complexities[complexity] += sign
+        self.sections[section] += sign
+        self.section_confidence[section] += sign * confidence
+
+
+class PredictionColumns(NamedTuple):
+    """Column arrays for a selection of recorded predictions"""
+    timestamp_ns: np.ndarray
+    confidence: np.ndarray
+    processing_time: np.ndarray
+    case_type: np.ndarray
+    complexity: np.ndarray
+    section: np.ndarray
+
+
+class PredictionStore:
+    """Fixed-capacity ring buffer of predictions kept as parallel NumPy columns"""
+
+    def __init__(self, capacity: int = PREDICTION_CAPACITY):
+        self.capacity = capacity
+        self.timestamp_ns = np.zeros(capacity, dtype=np.int64)
+        self.confidence = np.zeros(capacity, dtype=np.float64)
+        self.processing_time = np.zeros(capacity, dtype=np.float64)
+        self.case_type = np.zeros(capacity, dtype=np.intp)
+        self.complexity = np.zeros(capacity, dtype=np.intp)
+        self.section = np.zeros(capacity, dtype=np.intp)
+        self.case_types = CodeTable(CASE_TYPES)
+        self.complexities = CodeTable(COMPLEXITY_LEVELS)
+        self.sections = CodeTable()
+        # Per-hour totals kept in step with the buffer, keyed by timestamp_ns // HOUR_NS
+        self.hourly: Dict[int, HourlyAggregate] = {}
+        self._cursor = 0
+        self._size = 0
+        # Bumped on every write so cached aggregates can tell they are stale
+        self.version = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp_ns: int, case_type: str, predicted_section: str,
+               confidence: float, complexity: str, processing_time: float):
+        """Write one prediction, overwriting the oldest once the buffer is full"""
+        i = self._cursor
+        if i < self._size:
+            self._track_rows(-1, [i])
+        self.timestamp_ns[i] = timestamp_ns
+        self.confidence[i] = confidence
+        self.processing_time[i] = processing_time
+        self.case_type[i] = self.case_types.code(case_type)
+        self.complexity[i] = self.complexities.code(complexity)
+        self.section[i] = self.sections.code(predicted_section)
+        self._track_rows(1, [i])
+        self._cursor = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        self.version += 1
+
+    def extend(self, timestamp_ns: np.ndarray, case_type: np.ndarray, predicted_section: np.ndarray,
+               confidence: np.ndarray, complexity: np.ndarray, processing_time: np.ndarray):
+        """Write a batch of predictions given as column arrays, oldest first"""
+        # Only the newest `capacity` rows can survive the write
+        keep = slice(-self.capacity, None)
+        timestamp_ns = timestamp_ns[keep]
+        count = timestamp_ns.size
+        positions = (self._cursor + np.arange(count)) % self.capacity
+        self._track_rows(-1, positions[positions < self._size].tolist())
+
+        self.timestamp_ns[positions] = timestamp_ns
+        self.confidence[positions] = confidence[keep]
+        self.processing_time[positions] = processing_time[keep]
+        self.case_type[positions] = self._encode(self.case_types, case_type[keep])
+        self.complexity[positions] = self._encode(self.complexities, complexity[keep])
+        self.section[positions] = self._encode(self.sections, predicted_section[keep])
+        self._track_rows(1, positions.tolist())
+        self._cursor = (self._cursor + count) % self.capacity
+        self._size = min(self._size + count, self.capacity)
+        self.version += 1
+
+    def _track_rows(self, sign: int, positions: List[int]):
+        """Add or remove the rows at positions from their hourly aggregates"""
+        for i in positions:
+            hour = int(self.timestamp_ns[i]) // HOUR_NS
+            aggregate = self.hourly.get(hour)
+            if aggregate is None:
+                aggregate = self.hourly[hour] = HourlyAggregate()
+            aggregate.add(
+                sign,
+                float(self.confidence[i]),
+                float(self.processing_time[i]),
+                int(self.case_type[i]),
+                int(self.complexity[i]),
+                int(self.section[i])
+            )
+            if aggregate.count == 0:
+                del self.hourly[hour]
+
+    def recent_hours(self, now_ns: int, hours: int) -> List[HourlyAggregate]:
+        """Aggregates for the current hour and the `hours - 1` hours before it"""
+        current_hour = now_ns // HOUR_NS
+        return [
+            self.hourly[hour]
+            for hour in range(current_hour - hours + 1, current_hour + 1)
+            if hour in self.hourly
+        ]
+
+    @staticmethod
+    def _encode(table: CodeTable, labels: np.ndarray) -> np.ndarray:
+        """Codes for an array of labels, looking up each distinct label once"""
+        unique_labels, inverse = np.unique(labels, return_inverse=True)
+        return np.array([table.code(str(label)) for label in unique_labels], dtype=np.intp)[inverse]
+
+    def select(self, since_ns: Optional[int] = None) -> PredictionColumns:
+        """Columns for stored predictions, optionally only those newer than since_ns"""
+        filled = slice(0, self._size)
+        columns = PredictionColumns(
+            self.timestamp_ns[filled],
+            self.confidence[filled],
+            self.processing_time[filled],
+            self.case_type[filled],
+            self.complexity[filled],
+            self.section[filled]
+        )
+        if since_ns is None:
+            return columns
+        mask = columns.timestamp_ns > since_ns
+        return PredictionColumns(*(column[mask] for column in columns))
+
+
+def _merge_counts(aggregates: List[HourlyAggregate], field: str, size: int) -> np.ndarray:
+    """Sum one per-code mapping of several hourly aggregates into an array indexed by code"""
+    totals = np.zeros(size)
+    for aggregate in aggregates:
+        for code, value in getattr(aggregate, field).items():
+            totals[code] += value
+    return totals
+
+
+def _label_counts(counts: np.ndarray, table: CodeTable) -> Dict[str, int]:
+    """Non-zero counts keyed by label"""
+    return {table.labels[code]: int(count) for code, count in enumerate(counts) if count}
+
+
+# Static insight content; returned as-is, so callers must treat it as read-only
+_AI_INSIGHTS = {
+    'model_performance': {
+        'status': 'Excellent',
+        'accuracy_trend': 'Improving',
+        'confidence_stability': 'High',
+        'recommendations': [
+            'Model performance is optimal for current workload',
+            'Consider expanding training data for edge cases',
+            'High confidence predictions are consistently accurate'
+        ]
+    },
+    'case_analysis': {
+        'complex_cases_ratio': 0.23,
+        'average_resolution_time': '2.3 days',
+        'common_patterns': [
+            'Property disputes peak on Mondays',
+            'Criminal cases show higher complexity in urban areas',
+            'Fraud cases require additional verification steps'
+        ],
+        'prediction_accuracy_by_type': {
+            'criminal': 0.847,
+            'civil': 0.791,
+            'commercial': 0.823
+        }
+    },
+    'system_optimization': {
+        'bottlenecks': ['Database query optimization needed'],
+        'efficiency_gains': ['+15% processing speed this month'],
+        'resource_usage': 'Optimal',
+        'scalability_status': 'Ready for 2x load increase'
+    },
+    'legal_trends': {
+        'emerging_case_types': ['Cyber fraud', 'Digital harassment'],
+        'seasonal_patterns': ['Dowry cases increase during wedding season'],
+        'geographic_insights': ['Urban areas: 60% technology-related crimes']
+    }
+}
+
+# Forecast content that does not change between calls
+_PREDICTIVE_STATIC = {
+    'case_outcome_prediction': {
+        'success_probability': {
+            'high_confidence_cases': 0.92,
+            'medium_confidence_cases': 0.78,
+            'low_confidence_cases': 0.56
+        },
+        'estimated_duration': {
+            'simple_cases': '1-2 hearings',
+            'complex_cases': '4-6 hearings',
+            'appeals': '2-3 months average'
+        }
+    },
+    'resource_optimization': {
+        'judge_allocation': 'Optimal for current caseload',
+        'court_utilization': '87% efficiency',
+        'scheduling_suggestions': [
+            'Group similar case types for efficiency',
+            'Reserve mornings for complex criminal cases',
+            'Afternoon slots suitable for civil matters'
+        ]
+    }
+}
+
+
+def _group_stats(codes: np.ndarray, confidence: np.ndarray, group_count: int, threshold: float):
+    """Per-group prediction count, confidence sum and count at or above threshold"""
+    counts = np.bincount(codes, minlength=group_count)
+    confidence_sums = np.bincount(codes, weights=confidence, minlength=group_count)
+    above_threshold = np.bincount(codes[confidence >= threshold], minlength=group_count)
+    return counts, confidence_sums, above_threshold
+
+
+def _cached(method):
+    """Reuse a method's result for ANALYTICS_CACHE_TTL_SECONDS unless a prediction is recorded"""
+
+    @functools.wraps(method)
+    def wrapper(self):
+        key = (method.__name__, self.predictions.version)
+        result = self._cache.get(key)
+        if result is None:
+            result = method(self)
+            self._cache.set(key, result)
+        return result
+
+    return wrapper
 
 
 class AdvancedAnalyticsService:
     """Advanced analytics service for comprehensive system insights"""
 
     def __init__(self):
+        self.predictions = PredictionStore()
+        self._cache = TTLCache(maxsize=16, ttl=ANALYTICS_CACHE_TTL_SECONDS)
         self.analytics_data = {
-            'predictions': [],
             'performance_metrics': {},
             'usage_statistics': {},
             'system_health': {}
@@ -25,23 +331,21 @@ class AdvancedAnalyticsService:
     def initialize_analytics(self):
         """Initialize analytics with sample data for demonstration"""
 
-        # Sample prediction data
-        sample_predictions = [
-            {
-                'timestamp': datetime.now() - timedelta(hours=i),
-                'case_type': random.choice(['criminal', 'civil']),
-                'predicted_section': random.choice([
-                    'Section 103 - Murder', 'Section 303 - Theft', 'Section 318 - Fraud',
-                    'Section 115 - Assault', 'Section 137 - Kidnapping', 'Civil Code Section 101'
-                ]),
-                'confidence': random.uniform(0.6, 0.95),
-                'complexity': random.choice(['Low', 'Medium', 'High']),
-                'processing_time': random.uniform(0.1, 2.5)
-            }
-            for i in range(50)
+        # Sample prediction data, drawn column by column; the newest sample is written last
+        sections = [
+            'Section 103 - Murder', 'Section 303 - Theft', 'Section 318 - Fraud',
+            'Section 115 - Assault', 'Section 137 - Kidnapping', 'Civil Code Section 101'
         ]
-
-        self.analytics_data['predictions'] = sample_predictions
+        sample_count = 50
+        hours_ago = np.arange(sample_count - 1, -1, -1)
+        self.predictions.extend(
+            timestamp_ns=time.time_ns() - hours_ago * HOUR_NS,
+            case_type=_rng.choice(CASE_TYPES, sample_count),
+            predicted_section=_rng.choice(sections, sample_count),
+            confidence=_rng.uniform(0.6, 0.95, sample_count),
+            complexity=_rng.choice(COMPLEXITY_LEVELS, sample_count),
+            processing_time=_rng.uniform(0.1, 2.5, sample_count)
+        )
 
         # Performance metrics
         self.analytics_data['performance_metrics'] = {
@@ -52,7 +356,7 @@ class AdvancedAnalyticsService:
             'average_confidence': 0.782,
             'processing_speed': 1.23,  # seconds average
             'uptime': 99.7,  # percentage
-            'total_processed': len(sample_predictions)
+            'total_processed': sample_count
         }
 
         # Usage statistics
@@ -65,65 +369,67 @@ class AdvancedAnalyticsService:
             'user_satisfaction': 4.3  # out of 5
         }
 
+    @_cached
     def get_real_time_metrics(self) -> Dict:
         """Get real-time system metrics for dashboard"""
 
-        current_time = datetime.now()
-
-        # Calculate recent activity (last 24 hours)
-        recent_predictions = [
-            p for p in self.analytics_data['predictions']
-            if (current_time - p['timestamp']).total_seconds() < 86400
-        ]
-
-        # Confidence distribution
-        confidence_dist = {
-            'high': len([p for p in recent_predictions if p['confidence'] >= 0.8]),
-            'medium': len([p for p in recent_predictions if 0.6 <= p['confidence'] < 0.8]),
-            'low': len([p for p in recent_predictions if p['confidence'] < 0.6])
-        }
+        # Last 24 hours from the running hourly totals; no scan over the predictions
+        table = self.predictions
+        recent_hours = table.recent_hours(time.time_ns(), 24)
+        total = sum(aggregate.count for aggregate in recent_hours)
 
-        # Case type distribution
-        case_types = Counter([p['case_type'] for p in recent_predictions])
+        high = sum(aggregate.high for aggregate in recent_hours)
+        low = sum(aggregate.low for aggregate in recent_hours)
+        confidence_dist = {'high': high, 'medium': total - high - low, 'low': low}
 
-        # Complexity analysis
-        complexity_dist = Counter([p['complexity'] for p in recent_predictions])
+        case_type_counts = _merge_counts(recent_hours, 'case_types', len(table.case_types.labels))
+        complexity_counts = _merge_counts(recent_hours, 'complexities', len(table.complexities.labels))
+        case_types = _label_counts(case_type_counts, table.case_types)
+        complexity_dist = _label_counts(complexity_counts, table.complexities)
 
         # Performance trends
-        avg_confidence = sum([p['confidence'] for p in recent_predictions]) / len(recent_predictions) if recent_predictions else 0
-        avg_processing_time = sum([p['processing_time'] for p in recent_predictions]) / len(recent_predictions) if recent_predictions else 0
+        avg_confidence = sum(aggregate.confidence_sum for aggregate in recent_hours) / total if total else 0
+        avg_processing_time = sum(aggregate.processing_time_sum for aggregate in recent_hours) / total if total else 0
+
+        section_total = len(table.sections.labels)
+        section_counts = _merge_counts(recent_hours, 'sections', section_total)
+        section_confidence = _merge_counts(recent_hours, 'section_confidence', section_total)
 
         return {
             'overview': {
-                'total_predictions_24h': len(recent_predictions),
-                'average_confidence': round(avg_confidence, 3),
-                'average_processing_time': round(avg_processing_time, 2),
-                'success_rate': round((confidence_dist['high'] + confidence_dist['medium']) / len(recent_predictions) * 100, 1) if recent_predictions else 0
+                'total_predictions_24h': total,
+                'average_confidence': avg_confidence,
+                'average_processing_time': avg_processing_time,
+                'success_rate': (confidence_dist['high'] + confidence_dist['medium']) / total * 100 if total else 0
             },
             'confidence_distribution': confidence_dist,
-            'case_type_distribution': dict(case_types),
-            'complexity_distribution': dict(complexity_dist),
+            'case_type_distribution': case_types,
+            'complexity_distribution': complexity_dist,
             'performance_metrics': self.analytics_data['performance_metrics'],
-            'trending_sections': self._get_trending_sections(recent_predictions),
+            'trending_sections': self._get_trending_sections(section_counts, section_confidence),
             'accuracy_trend': self._generate_accuracy_trend(),
             'usage_patterns': self._analyze_usage_patterns()
         }
 
-    def _get_trending_sections(self, predictions: List[Dict]) -> List[Dict]:
-        """Get trending BNS sections"""
-        section_counts = Counter([p['predicted_section'] for p in predictions])
+    def _get_trending_sections(self, section_counts: np.ndarray, confidence_sums: np.ndarray) -> List[Dict]:
+        """Get trending BNS sections from per-section counts and confidence sums"""
+
+        # Five most common sections: partial selection, then order just those
+        top_sections = np.flatnonzero(section_counts)
+        if top_sections.size > 5:
+            top_sections = np.sort(top_sections[np.argpartition(-section_counts[top_sections], 4)[:5]])
+        # The stable sort keeps first-seen order among ties
+        top_sections = top_sections[np.argsort(-section_counts[top_sections], kind='stable')]
 
         trending = []
-        for section, count in section_counts.most_common(5):
-            avg_confidence = sum([
-                p['confidence'] for p in predictions
-                if p['predicted_section'] == section
-            ]) / count
+        for code in top_sections:
+            count = int(section_counts[code])
+            avg_confidence = float(confidence_sums[code]) / count
 
             trending.append({
-                'section': section,
+                'section': self.predictions.sections.labels[code],
                 'count': count,
-                'average_confidence': round(avg_confidence, 3),
+                'average_confidence': avg_confidence,
                 'trend': 'up' if count > 3 else 'stable'
             })
 
@@ -133,110 +439,89 @@ class AdvancedAnalyticsService:
         """Generate accuracy trend data for charts"""
 
         # Generate hourly accuracy data for last 24 hours
-        trend_data = []
         current_time = datetime.now()
+        predictions = self.predictions.select()
 
-        for i in range(24):
-            hour_start = current_time - timedelta(hours=i)
-            hour_predictions = [
-                p for p in self.analytics_data['predictions']
-                if abs((p['timestamp'] - hour_start).total_seconds()) < 3600
-            ]
+        # Bucket each prediction by whole hours ago in one pass, then count per bucket
+        hours_ago = (time.time_ns() - predictions.timestamp_ns) // HOUR_NS
+        in_window = (hours_ago >= 0) & (hours_ago < 24)
+        hours_ago = hours_ago[in_window]
+        hour_counts = np.bincount(hours_ago, minlength=24)
+        high_counts = np.bincount(hours_ago, weights=predictions.confidence[in_window] >= 0.8, minlength=24)
+
+        # Emit hours in clock order ("00:00" first), matching the previous sort by label
+        trend_data = []
+        for hour in range(24):
+            i = (current_time.hour - hour) % 24
+            hour_count = int(hour_counts[i])
 
-            if hour_predictions:
-                high_conf = len([p for p in hour_predictions if p['confidence'] >= 0.8])
-                accuracy = (high_conf / len(hour_predictions)) * 100
+            if hour_count:
+                accuracy = (float(high_counts[i]) / hour_count) * 100
             else:
                 accuracy = random.uniform(75, 90)  # Mock data
 
             trend_data.append({
-                'hour': hour_start.strftime('%H:00'),
-                'accuracy': round(accuracy, 1),
-                'predictions_count': len(hour_predictions)
+                'hour': f'{hour:02d}:00',
+                'accuracy': accuracy,
+                'predictions_count': hour_count
             })
 
-        return sorted(trend_data, key=lambda x: x['hour'])
+        return trend_data
 
     def _analyze_usage_patterns(self) -> Dict:
         """Analyze system usage patterns"""
 
-        # Mock usage pattern analysis
+        patterns = self._cache.get('usage_patterns')
+        if patterns is not None:
+            return patterns
+
+        # Mock usage pattern analysis, drawing the volatile figures in two batched calls
+        concurrent_users, database_connections = _rng.integers([15, 25], [36, 46]).tolist()
+        cpu_usage, memory_usage = _rng.uniform([45, 60], [75, 80]).tolist()
         patterns = {
             'peak_hours': [9, 10, 11, 14, 15, 16],  # Business hours
             'peak_days': ['Monday', 'Tuesday', 'Wednesday'],
             'user_activity': {
                 'new_cases_per_hour': 12.3,
                 'average_session_length': 18.7,
-                'concurrent_users': random.randint(15, 35)
+                'concurrent_users': concurrent_users
             },
             'system_load': {
-                'cpu_usage': random.uniform(45, 75),
-                'memory_usage': random.uniform(60, 80),
-                'database_connections': random.randint(25, 45)
+                'cpu_usage': cpu_usage,
+                'memory_usage': memory_usage,
+                'database_connections': database_connections
             }
         }
+        self._cache.set('usage_patterns', patterns, ttl=USAGE_PATTERNS_TTL_SECONDS)
 
         return patterns
 
     def get_ai_insights(self) -> Dict:
         """Generate AI-powered insights for the dashboard"""
+        return _AI_INSIGHTS
 
-        insights = {
-            'model_performance': {
-                'status': 'Excellent',
-                'accuracy_trend': 'Improving',
-                'confidence_stability': 'High',
-                'recommendations': [
-                    'Model performance is optimal for current workload',
-                    'Consider expanding training data for edge cases',
-                    'High confidence predictions are consistently accurate'
-                ]
-            },
-            'case_analysis': {
-                'complex_cases_ratio': 0.23,
-                'average_resolution_time': '2.3 days',
-                'common_patterns': [
-                    'Property disputes peak on Mondays',
-                    'Criminal cases show higher complexity in urban areas',
-                    'Fraud cases require additional verification steps'
-                ],
-                'prediction_accuracy_by_type': {
-                    'criminal': 0.847,
-                    'civil': 0.791,
-                    'commercial': 0.823
-                }
-            },
-            'system_optimization': {
-                'bottlenecks': ['Database query optimization needed'],
-                'efficiency_gains': ['+15% processing speed this month'],
-                'resource_usage': 'Optimal',
-                'scalability_status': 'Ready for 2x load increase'
-            },
-            'legal_trends': {
-                'emerging_case_types': ['Cyber fraud', 'Digital harassment'],
-                'seasonal_patterns': ['Dowry cases increase during wedding season'],
-                'geographic_insights': ['Urban areas: 60% technology-related crimes']
-            }
-        }
-
-        return insights
-
+    @_cached
     def get_predictive_analytics(self) -> Dict:
         """Generate predictive analytics for court scheduling and workload"""
 
-        predictions = {
+        # Only the mock forecast figures vary; draw them in one call (bounds match randint's inclusive ranges)
+        next_week, high, medium, low, next_month = _rng.integers(
+            [45, 8, 20, 15, 180], [66, 16, 31, 26, 221]
+        ).tolist()
+
+        return {
             'workload_forecast': {
                 'next_week': {
-                    'estimated_cases': random.randint(45, 65),
+                    'estimated_cases': next_week,
                     'complexity_breakdown': {
-                        'high': random.randint(8, 15),
-                        'medium': random.randint(20, 30),
-                        'low': random.randint(15, 25)
+                        'high': high,
+                        'medium': medium,
+                        'low': low
                     },
                     'resource_requirements': 'Normal staffing sufficient'
                 },
                 'next_month': {
-                    'estimated_cases': random.randint(180, 220),
+                    'estimated_cases': next_month,
                     'peak_periods': ['First week', 'Third week'],
                     'recommended_actions': [
                         'Schedule additional hearings for week 3',
@@ -244,62 +529,39 @@ class AdvancedAnalyticsService:
                     ]
                 }
             },
-            'case_outcome_prediction': {
-                'success_probability': {
-                    'high_confidence_cases': 0.92,
-                    'medium_confidence_cases': 0.78,
-                    'low_confidence_cases': 0.56
-                },
-                'estimated_duration': {
-                    'simple_cases': '1-2 hearings',
-                    'complex_cases': '4-6 hearings',
-                    'appeals': '2-3 months average'
-                }
-            },
-            'resource_optimization': {
-                'judge_allocation': 'Optimal for current caseload',
-                'court_utilization': '87% efficiency',
-                'scheduling_suggestions': [
-                    'Group similar case types for efficiency',
-                    'Reserve mornings for complex criminal cases',
-                    'Afternoon slots suitable for civil matters'
-                ]
-            }
+            **_PREDICTIVE_STATIC
         }
 
-        return predictions
-
     def record_prediction(self, prediction_data: Dict):
         """Record a new prediction for analytics"""
 
-        prediction_data['timestamp'] = datetime.now()
-        self.analytics_data['predictions'].append(prediction_data)
-
-        # Keep only last 1000 predictions to manage memory
-        if len(self.analytics_data['predictions']) > 1000:
-            self.analytics_data['predictions'] = self.analytics_data['predictions'][-1000:]
-
+        # The store keeps the last PREDICTION_CAPACITY predictions
+        self.predictions.append(
+            timestamp_ns=time.time_ns(),
+            case_type=prediction_data['case_type'],
+            predicted_section=prediction_data['predicted_section'],
+            confidence=prediction_data['confidence'],
+            complexity=prediction_data['complexity'],
+            processing_time=prediction_data['processing_time']
+        )
+
+    @_cached
     def get_performance_report(self) -> Dict:
         """Generate comprehensive performance report"""
 
-        current_time = datetime.now()
-
-        # Last 7 days analysis
-        week_predictions = [
-            p for p in self.analytics_data['predictions']
-            if (current_time - p['timestamp']).days <= 7
-        ]
+        # Last 7 days analysis (whole days of age, as timedelta.days <= 7)
+        week_predictions = self.predictions.select(since_ns=time.time_ns() - 8 * DAY_NS)
+        week_confidence = week_predictions.confidence
+        week_total = week_confidence.size
 
         report = {
             'summary': {
                 'report_period': '7 days',
-                'total_predictions': len(week_predictions),
-                'average_confidence': round(
-                    sum([p['confidence'] for p in week_predictions]) / len(week_predictions), 3
-                ) if week_predictions else 0,
-                'high_confidence_rate': round(
-                    len([p for p in week_predictions if p['confidence'] >= 0.8]) / len(week_predictions) * 100, 1
-                ) if week_predictions else 0
+                'total_predictions': week_total,
+                'average_confidence': float(week_confidence.mean()) if week_total else 0,
+                'high_confidence_rate': (
+                    int(np.count_nonzero(week_confidence >= 0.8)) / week_total * 100
+                ) if week_total else 0
             },
             'trends': {
                 'week_over_week_growth': random.uniform(5, 15),
@@ -321,74 +583,64 @@ class AdvancedAnalyticsService:
 
         return report
 
-    def _analyze_by_case_type(self, predictions: List[Dict]) -> Dict:
+    def _analyze_by_case_type(self, predictions: PredictionColumns) -> Dict:
         """Analyze predictions by case type"""
 
-        case_types = defaultdict(list)
-        for p in predictions:
-            case_types[p['case_type']].append(p['confidence'])
+        labels = self.predictions.case_types.labels
+        counts, confidence_sums, high_counts = _group_stats(
+            predictions.case_type, predictions.confidence, len(labels), 0.8
+        )
 
         analysis = {}
-        for case_type, confidences in case_types.items():
-            analysis[case_type] = {
-                'count': len(confidences),
-                'average_confidence': round(sum(confidences) / len(confidences), 3),
-                'high_confidence_rate': round(
-                    len([c for c in confidences if c >= 0.8]) / len(confidences) * 100, 1
-                )
+        for code in np.flatnonzero(counts):
+            count = int(counts[code])
+            analysis[labels[code]] = {
+                'count': count,
+                'average_confidence': float(confidence_sums[code]) / count,
+                'high_confidence_rate': int(high_counts[code]) / count * 100
             }
 
         return analysis
 
-    def _analyze_by_complexity(self, predictions: List[Dict]) -> Dict:
+    def _analyze_by_complexity(self, predictions: PredictionColumns) -> Dict:
         """Analyze predictions by complexity level"""
 
-        complexity_levels = defaultdict(list)
-        for p in predictions:
-            complexity_levels[p['complexity']].append(p['confidence'])
+        labels = self.predictions.complexities.labels
+        counts, confidence_sums, success_counts = _group_stats(
+            predictions.complexity, predictions.confidence, len(labels), 0.7
+        )
 
         analysis = {}
-        for complexity, confidences in complexity_levels.items():
-            analysis[complexity] = {
-                'count': len(confidences),
-                'average_confidence': round(sum(confidences) / len(confidences), 3),
-                'success_rate': round(
-                    len([c for c in confidences if c >= 0.7]) / len(confidences) * 100, 1
-                )
+        for code in np.flatnonzero(counts):
+            count = int(counts[code])
+            analysis[labels[code]] = {
+                'count': count,
+                'average_confidence': float(confidence_sums[code]) / count,
+                'success_rate': int(success_counts[code]) / count * 100
             }
 
         return analysis
 
-    def _analyze_by_confidence(self, predictions: List[Dict]) -> Dict:
+    def _analyze_by_confidence(self, predictions: PredictionColumns) -> Dict:
         """Analyze prediction distribution by confidence levels"""
 
-        high_conf = [p for p in predictions if p['confidence'] >= 0.8]
-        medium_conf = [p for p in predictions if 0.6 <= p['confidence'] < 0.8]
-        low_conf = [p for p in predictions if p['confidence'] < 0.6]
+        total = predictions.confidence.size
 
-        return {
-            'high_confidence': {
-                'count': len(high_conf),
-                'percentage': round(len(high_conf) / len(predictions) * 100, 1) if predictions else 0,
-                'avg_processing_time': round(
-                    sum([p['processing_time'] for p in high_conf]) / len(high_conf), 2
-                ) if high_conf else 0
-            },
-            'medium_confidence': {
-                'count': len(medium_conf),
-                'percentage': round(len(medium_conf) / len(predictions) * 100, 1) if predictions else 0,
-                'avg_processing_time': round(
-                    sum([p['processing_time'] for p in medium_conf]) / len(medium_conf), 2
-                ) if medium_conf else 0
-            },
-            'low_confidence': {
-                'count': len(low_conf),
-                'percentage': round(len(low_conf) / len(predictions) * 100, 1) if predictions else 0,
-                'avg_processing_time': round(
-                    sum([p['processing_time'] for p in low_conf]) / len(low_conf), 2
-                ) if low_conf else 0
+        # Band index per prediction: 0 = low (< 0.6), 1 = medium, 2 = high (>= 0.8)
+        band_index = np.digitize(predictions.confidence, CONFIDENCE_BAND_EDGES)
+        counts = np.bincount(band_index, minlength=3)
+        time_sums = np.bincount(band_index, weights=predictions.processing_time, minlength=3)
+
+        analysis = {}
+        for band in (2, 1, 0):
+            count = int(counts[band])
+            analysis[CONFIDENCE_BANDS[band]] = {
+                'count': count,
+                'percentage': count / total * 100 if total else 0,
+                'avg_processing_time': float(time_sums[band]) / count if count else 0
             }
-        }
+
+        return analysis
 
 # Global analytics service instance
 advanced_analytics_service = AdvancedAnalyticsService()
@@ -3,15 +3,19 @@ AI Service for DCM System
 Provides AI-powered features like case classification, document analysis, and recommendations
 """
 
+import functools
+import itertools
 import json
 import logging
-import pickle
 import re
+import threading
+import time
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
 
-# Import model compatibility layer FIRST (before pickle loading)
+# Import model compatibility layer FIRST (before model loading)
 try:
     from .model_compat import EnhancedBNSClassifierV2
 except ImportError:
@@ -19,19 +23,220 @@ except ImportError:
 
 # ML and NLP imports
 try:
+    import joblib
     import nltk
     import numpy as np
     from nltk.stem import WordNetLemmatizer
     from nltk.tokenize import sent_tokenize, word_tokenize
     from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity
     SKLEARN_AVAILABLE = True
 except ImportError as e:
     print(f"Warning: Some ML libraries not available: {e}")
     SKLEARN_AVAILABLE = False
 
+# Optional: single-pass multi-keyword matching
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# NLTK download names and where nltk.data.find locates each resource
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'stopwords': 'corpora/stopwords',
+    'wordnet': 'corpora/wordnet',
+    'omw-1.4': 'corpora/omw-1.4'
+}
+
+# NLTK resources are looked up (and downloaded if missing) once per process
+_nltk_data_checked = False
+
+# The same case text is preprocessed by every pipeline stage; repeats are served from memory
+PREPROCESS_CACHE_SIZE = 50_000
+LEMMA_CACHE_SIZE = 100_000
+
+_NON_ALNUM_RE = re.compile(r'[^a-zA-Z0-9\s]')
+_NAME_RE = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b')
+_AMOUNT_RE = re.compile(r'(?:Rs\.?|₹|\$)\s*(\d+(?:,\d+)*(?:\.\d+)?)', re.IGNORECASE)
+_CASE_NUMBER_RE = re.compile(r'(?:Case|FIR|Complaint)[\s\w]*?No\.?\s*(\w+/\d+/\d+|\d+/\d+)', re.IGNORECASE)
+
+# Capitalized words that are legal terms rather than names
+_LEGAL_STOPWORDS = frozenset({'Court', 'Judge', 'Justice', 'Honorable', 'Section', 'Act', 'Rule', 'Order'})
+
+# Bounds entity extraction on very long documents
+MAX_NAME_ENTITIES = 10
+MAX_PATTERN_ENTITIES = 50
+
+# DD/MM/YYYY or MM/DD/YYYY, DD Month YYYY and Month DD, YYYY, found in a single scan
+_DATE_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in (
+    r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b',
+    r'\b\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{2,4}\b',
+    r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{2,4}\b',
+)), re.IGNORECASE)
+
+# Checked in order; the first document type with any matching phrase wins
+_DOCUMENT_TYPE_PATTERNS = {
+    "Petition": ["petition", "petitioner", "pray", "relief sought"],
+    "Judgment": ["judgment", "judgement", "court orders", "hereby ordered"],
+    "Pleading": ["pleading", "statement of claim", "defence", "counter claim"],
+    "Contract": ["agreement", "contract", "terms and conditions", "whereas"],
+    "Evidence": ["exhibit", "evidence", "witness statement", "affidavit"],
+    "Notice": ["notice", "summons", "citation", "hereby notified"],
+    "Brief": ["brief", "argument", "case law", "precedent"],
+    "Order": ["order", "court order", "interim order", "final order"]
+}
+
+# Rule-based classification fallback
+_CATEGORY_RULES = {
+    "Criminal": {
+        "patterns": ["theft", "murder", "assault", "robbery", "fraud", "criminal", "accused", "defendant"],
+        "sections": ["Section 103", "Section 304", "Section 318"],
+        "priority": "high"
+    },
+    "Civil": {
+        "patterns": ["property", "contract", "breach", "damages", "plaintiff", "civil", "dispute", "tort"],
+        "sections": ["Section 101", "Section 137", "Section 140"],
+        "priority": "medium"
+    },
+    "Family": {
+        "patterns": ["divorce", "custody", "marriage", "family", "child", "spouse", "alimony"],
+        "sections": ["Section 294", "Section 295"],
+        "priority": "medium"
+    },
+    "Commercial": {
+        "patterns": ["business", "company", "corporate", "commercial", "trade", "partnership"],
+        "sections": ["Section 327", "Section 328"],
+        "priority": "medium"
+    }
+}
+
+# Map sections to case types (based on the BNS model)
+_SECTION_CASE_TYPES = {
+    "Section 103": "Criminal", "Section 304": "Criminal", "Section 318": "Criminal", "Section 319": "Criminal",
+    "Section 101": "Civil", "Section 137": "Civil", "Section 140": "Civil",
+    "Section 294": "Family", "Section 295": "Family",
+    "Section 327": "Commercial", "Section 328": "Commercial"
+}
+
+_HIGH_PRIORITY_KEYWORDS = ["urgent", "emergency", "immediate", "murder", "assault", "fraud"]
+_LOW_PRIORITY_KEYWORDS = ["routine", "standard", "minor", "simple"]
+
+_POSITIVE_WORDS = ['agree', 'accept', 'approve', 'satisfied', 'success', 'win', 'favorable']
+_NEGATIVE_WORDS = ['dispute', 'deny', 'reject', 'fail', 'violation', 'breach', 'guilty', 'liable']
+
+_LEGAL_TERMS = [
+    'plaintiff', 'defendant', 'petitioner', 'respondent', 'appellant', 'court',
+    'judgment', 'order', 'decree', 'injunction', 'damages', 'compensation',
+    'evidence', 'witness', 'testimony', 'affidavit', 'contract', 'agreement',
+    'breach', 'violation', 'liability', 'negligence', 'jurisdiction',
+    'appeal', 'revision', 'writ', 'habeas corpus', 'mandamus', 'certiorari'
+]
+
+# Case complexity indicators
+_COMPLEX_KEYWORDS = [
+    'multiple parties', 'cross-claim', 'counter-claim', 'class action',
+    'constitutional', 'international', 'corporate', 'merger', 'acquisition',
+    'intellectual property', 'patent', 'copyright', 'trademark',
+    'securities', 'fraud', 'conspiracy', 'racketeering'
+]
+_SIMPLE_KEYWORDS = [
+    'traffic violation', 'minor', 'simple', 'straightforward',
+    'routine', 'standard procedure', 'uncontested'
+]
+
+
+class KeywordMatcher:
+    """Finds which keywords of several named lists occur as substrings of a text"""
+
+    def __init__(self, keyword_lists: Dict[str, Sequence[str]]):
+        self.keyword_lists = keyword_lists
+        self._automaton = None
+        if AHOCORASICK_AVAILABLE:
+            # One Aho-Corasick automaton over every list: a single pass finds all lists' keywords
+            lists_by_keyword = defaultdict(list)
+            for name, keywords in keyword_lists.items():
+                for keyword in keywords:
+                    lists_by_keyword[keyword].append(name)
+            automaton = ahocorasick.Automaton()
+            for keyword, names in lists_by_keyword.items():
+                automaton.add_word(keyword, (keyword, tuple(names)))
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def find(self, text: str) -> Dict[str, FrozenSet[str]]:
+        """Keywords of each list found in text"""
+        if self._automaton is None:
+            return {
+                name: frozenset(keyword for keyword in keywords if keyword in text)
+                for name, keywords in self.keyword_lists.items()
+            }
+
+        found = defaultdict(set)
+        for _, (keyword, names) in self._automaton.iter(text):
+            for name in names:
+                found[name].add(keyword)
+        return {name: frozenset(found[name]) for name in self.keyword_lists}
+
+
+_KEYWORDS = KeywordMatcher({
+    **{f"category:{category}": rules["patterns"] for category, rules in _CATEGORY_RULES.items()},
+    **{f"document:{doc_type}": patterns for doc_type, patterns in _DOCUMENT_TYPE_PATTERNS.items()},
+    "high_priority": _HIGH_PRIORITY_KEYWORDS,
+    "low_priority": _LOW_PRIORITY_KEYWORDS,
+    "positive": _POSITIVE_WORDS,
+    "negative": _NEGATIVE_WORDS,
+    "legal": _LEGAL_TERMS,
+    "complex": _COMPLEX_KEYWORDS,
+    "simple": _SIMPLE_KEYWORDS
+})
+
+# (unix second, its ISO timestamp), shared by every insight generated within that second
+_last_timestamp = (0, '')
+
+
+def _utc_now_iso() -> str:
+    """Current UTC time as an ISO string at second precision, formatted at most once a second"""
+    global _last_timestamp
+    now = int(time.time())
+    if now != _last_timestamp[0]:
+        _last_timestamp = (now, datetime.utcfromtimestamp(now).isoformat())
+    return _last_timestamp[1]
+
+
+def _general_classification() -> Dict:
+    """Classification returned when a case cannot be classified"""
+    return {
+        "predicted_section": "General",
+        "confidence": 0.5,
+        "top_predictions": [{"section": "General", "confidence": 0.5}],
+        "case_type": "General",
+        "suggested_priority": "medium"
+    }
+
+
+def _top_k_indices(scores: "np.ndarray", k: int) -> "np.ndarray":
+    """Indices of the k highest scores, highest first, without sorting the whole array"""
+    k = min(k, scores.size)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    top = np.argpartition(scores, -k)[-k:]
+    return top[np.argsort(scores[top])[::-1]]
+
+
+def _top_predictions(probabilities: "np.ndarray", classes: "np.ndarray", k: int = 5) -> List[Dict]:
+    """Top k sections with their probabilities, converted to Python values in two tolist() calls"""
+    top = _top_k_indices(probabilities, k)
+    sections = np.asarray(classes)[top].tolist()
+    confidences = probabilities[top].astype(float).tolist()
+    return [
+        {"section": section, "confidence": confidence}
+        for section, confidence in zip(sections, confidences)
+    ]
+
+
 class AIService:
     """Main AI service class for DCM system"""
 
@@ -39,26 +244,38 @@ class AIService:
         self.model = None
         self.model_info = None
         self.vectorizer = None
+        # Similarity search corpus, refitted only when the cases change
+        self._corpus_vectorizer = None
+        self._corpus_matrix = None
+        self._corpus_cases = []
+        self._corpus_fingerprint = None
         self.lemmatizer = WordNetLemmatizer()
+        self._lemmatize = functools.lru_cache(maxsize=LEMMA_CACHE_SIZE)(self.lemmatizer.lemmatize)
+        self._preprocess_cached = functools.lru_cache(maxsize=PREPROCESS_CACHE_SIZE)(self._preprocess_text)
         self._download_nltk_data()
         self._load_models()
 
     def _download_nltk_data(self):
         """Download required NLTK data"""
+        global _nltk_data_checked
+        if _nltk_data_checked:
+            return
+
         try:
             nltk_data_path = Path.home() / 'nltk_data'
             nltk.data.path.append(str(nltk_data_path))
 
-            required_data = ['punkt', 'stopwords', 'wordnet', 'omw-1.4']
-            for data_name in required_data:
+            for data_name, resource_path in NLTK_RESOURCES.items():
                 try:
-                    nltk.data.find(f'tokenizers/{data_name}')
+                    nltk.data.find(resource_path)
                 except LookupError:
                     try:
                         nltk.download(data_name, quiet=True)
                     except Exception as e:
                         logger.warning(f"Could not download NLTK data {data_name}: {e}")
 
+            _nltk_data_checked = True
+
         except Exception as e:
             logger.warning(f"NLTK setup warning: {e}")
 
@@ -69,9 +286,8 @@ class AIService:
             info_path = Path("models/enhanced_model_info.json")
 
             if model_path.exists() and info_path.exists():
-                # Load model
-                with open(model_path, 'rb') as f:
-                    model_data = pickle.load(f)
+                # Memory-map the model's arrays: pages load on demand and are shared by forked workers
+                model_data = joblib.load(model_path, mmap_mode='r')
 
                 # Load model info
                 with open(info_path, 'r') as f:
@@ -127,12 +343,16 @@ class AIService:
         if not text:
             return ""
 
+        return self._preprocess_cached(text)
+
+    def _preprocess_text(self, text: str) -> str:
+        """Uncached body of preprocess_text"""
         try:
             # Convert to lowercase
             text = text.lower()
 
             # Remove special characters but keep spaces
-            text = re.sub(r'[^a-zA-Z0-9\s]', ' ', text)
+            text = _NON_ALNUM_RE.sub(' ', text)
 
             # Remove extra whitespace
             text = ' '.join(text.split())
@@ -140,7 +360,7 @@ class AIService:
             # Tokenize and lemmatize
             try:
                 tokens = word_tokenize(text)
-                lemmatized = [self.lemmatizer.lemmatize(token) for token in tokens]
+                lemmatized = [self._lemmatize(token) for token in tokens]
                 return ' '.join(lemmatized)
             except Exception:
                 # Fallback if NLTK operations fail
@@ -150,6 +370,10 @@ class AIService:
             logger.warning(f"Text preprocessing error: {e}")
             return text
 
+    def _has_trained_model(self) -> bool:
+        """Whether a model and a fitted vectorizer are loaded; the basic fallback vectorizer is never fitted"""
+        return self.model is not None and getattr(self.vectorizer, 'vocabulary_', None) is not None
+
     async def classify_case(self, case_description: str, case_title: str = "") -> Dict:
         """
         Classify a case using the BNS model
@@ -161,23 +385,13 @@ class AIService:
             processed_text = self.preprocess_text(combined_text)
 
             if not processed_text:
-                return {
-                    "predicted_section": "General",
-                    "confidence": 0.5,
-                    "top_predictions": [{"section": "General", "confidence": 0.5}],
-                    "case_type": "General",
-                    "suggested_priority": "medium"
-                }
+                return _general_classification()
 
             # If we have the trained model, use it
-            if self.model and self.vectorizer:
+            if self._has_trained_model():
                 try:
                     # Vectorize the text
-                    if hasattr(self.vectorizer, 'transform'):
-                        text_vector = self.vectorizer.transform([processed_text])
-                    else:
-                        # If vectorizer needs fitting, fit on the text
-                        text_vector = self.vectorizer.fit_transform([processed_text])
+                    text_vector = self.vectorizer.transform([processed_text])
 
                     # Make prediction
                     if hasattr(self.model, 'predict_proba'):
@@ -187,12 +401,7 @@ class AIService:
 
                         # Get top predictions
                         if hasattr(self.model, 'classes_'):
-                            classes = self.model.classes_
-                            top_indices = np.argsort(probabilities)[-5:][::-1]
-                            top_predictions = [
-                                {"section": classes[i], "confidence": float(probabilities[i])}
-                                for i in top_indices
-                            ]
+                            top_predictions = _top_predictions(probabilities, self.model.classes_)
                         else:
                             top_predictions = [{"section": str(prediction), "confidence": float(confidence)}]
                     else:
@@ -222,45 +431,16 @@ class AIService:
 
         except Exception as e:
             logger.error(f"Case classification error: {e}")
-            return {
-                "predicted_section": "General",
-                "confidence": 0.5,
-                "top_predictions": [{"section": "General", "confidence": 0.5}],
-                "case_type": "General",
-                "suggested_priority": "medium"
-            }
+            return _general_classification()
 
     def _rule_based_classification(self, processed_text: str, original_text: str) -> Dict:
         """Rule-based classification as fallback"""
 
-        # Define rule-based patterns
-        patterns = {
-            "Criminal": {
-                "patterns": ["theft", "murder", "assault", "robbery", "fraud", "criminal", "accused", "defendant"],
-                "sections": ["Section 103", "Section 304", "Section 318"],
-                "priority": "high"
-            },
-            "Civil": {
-                "patterns": ["property", "contract", "breach", "damages", "plaintiff", "civil", "dispute", "tort"],
-                "sections": ["Section 101", "Section 137", "Section 140"],
-                "priority": "medium"
-            },
-            "Family": {
-                "patterns": ["divorce", "custody", "marriage", "family", "child", "spouse", "alimony"],
-                "sections": ["Section 294", "Section 295"],
-                "priority": "medium"
-            },
-            "Commercial": {
-                "patterns": ["business", "company", "corporate", "commercial", "trade", "partnership"],
-                "sections": ["Section 327", "Section 328"],
-                "priority": "medium"
-            }
-        }
-
         # Score each category
+        found = _KEYWORDS.find(processed_text)
         scores = {}
-        for category, data in patterns.items():
-            score = sum(1 for pattern in data["patterns"] if pattern in processed_text)
+        for category in _CATEGORY_RULES:
+            score = len(found[f"category:{category}"])
             if score > 0:
                 scores[category] = score
 
@@ -268,8 +448,8 @@ class AIService:
         if scores:
             best_category = max(scores, key=scores.get)
             confidence = min(0.9, scores[best_category] / 5.0)  # Normalize to confidence
-            predicted_section = patterns[best_category]["sections"][0]
-            priority = patterns[best_category]["priority"]
+            predicted_section = _CATEGORY_RULES[best_category]["sections"][0]
+            priority = _CATEGORY_RULES[best_category]["priority"]
         else:
             best_category = "General"
             predicted_section = "Section 101"
@@ -284,28 +464,17 @@ class AIService:
             "suggested_priority": priority
         }
 
-    def _determine_case_attributes(self, prediction: str, text: str) -> Tuple[str, str]:
-        """Determine case type and priority based on prediction and text"""
+    def _determine_case_attributes(self, prediction: str, processed_text: str) -> Tuple[str, str]:
+        """Determine case type and priority based on prediction and preprocessed (lowercase) text"""
 
-        # Map sections to case types (based on your BNS model)
-        section_to_type = {
-            "Section 103": "Criminal", "Section 304": "Criminal", "Section 318": "Criminal", "Section 319": "Criminal",
-            "Section 101": "Civil", "Section 137": "Civil", "Section 140": "Civil",
-            "Section 294": "Family", "Section 295": "Family",
-            "Section 327": "Commercial", "Section 328": "Commercial"
-        }
-
-        case_type = section_to_type.get(prediction, "General")
+        case_type = _SECTION_CASE_TYPES.get(prediction, "General")
 
         # Determine priority based on keywords
-        high_priority_keywords = ["urgent", "emergency", "immediate", "murder", "assault", "fraud"]
-        low_priority_keywords = ["routine", "standard", "minor", "simple"]
-
-        text_lower = text.lower()
+        found = _KEYWORDS.find(processed_text)
 
-        if any(keyword in text_lower for keyword in high_priority_keywords):
+        if found["high_priority"]:
             priority = "high"
-        elif any(keyword in text_lower for keyword in low_priority_keywords):
+        elif found["low_priority"]:
             priority = "low"
         elif case_type == "Criminal":
             priority = "high"
@@ -321,16 +490,26 @@ class AIService:
         try:
             processed_content = self.preprocess_text(content)
 
+            # Lowercase, split and keyword-match once; the helpers share these results
+            content_lower = content.lower()
+            words = content.split()
+            found = _KEYWORDS.find(content_lower)
+            try:
+                sentences = sent_tokenize(content)
+            except Exception:
+                # Punkt unavailable: summary and readability use their fallbacks
+                sentences = None
+
             # Extract key entities and information
             analysis = {
-                "document_type": self._detect_document_type(content, filename),
+                "document_type": self._detect_document_type(found, filename),
                 "key_entities": self._extract_entities(content),
-                "summary": self._generate_summary(content),
+                "summary": self._generate_summary(content, sentences),
                 "sentiment": self._analyze_sentiment(processed_content),
-                "word_count": len(content.split()),
-                "readability_score": self._calculate_readability(content),
+                "word_count": len(words),
+                "readability_score": self._calculate_readability(words, sentences),
                 "extracted_dates": self._extract_dates(content),
-                "legal_keywords": self._extract_legal_keywords(content)
+                "legal_keywords": self._extract_legal_keywords(found)
             }
 
             return analysis
@@ -348,29 +527,16 @@ class AIService:
                 "legal_keywords": []
             }
 
-    def _detect_document_type(self, content: str, filename: str) -> str:
-        """Detect the type of legal document"""
-
-        content_lower = content.lower()
+    def _detect_document_type(self, found: Dict[str, FrozenSet[str]], filename: str) -> str:
+        """Detect the type of legal document from the keywords found in its lowercased content"""
 
-        type_patterns = {
-            "Petition": ["petition", "petitioner", "pray", "relief sought"],
-            "Judgment": ["judgment", "judgement", "court orders", "hereby ordered"],
-            "Pleading": ["pleading", "statement of claim", "defence", "counter claim"],
-            "Contract": ["agreement", "contract", "terms and conditions", "whereas"],
-            "Evidence": ["exhibit", "evidence", "witness statement", "affidavit"],
-            "Notice": ["notice", "summons", "citation", "hereby notified"],
-            "Brief": ["brief", "argument", "case law", "precedent"],
-            "Order": ["order", "court order", "interim order", "final order"]
-        }
-
-        for doc_type, patterns in type_patterns.items():
-            if any(pattern in content_lower for pattern in patterns):
+        for doc_type in _DOCUMENT_TYPE_PATTERNS:
+            if found[f"document:{doc_type}"]:
                 return doc_type
 
         # Check filename for hints
         filename_lower = filename.lower()
-        for doc_type in type_patterns.keys():
+        for doc_type in _DOCUMENT_TYPE_PATTERNS:
             if doc_type.lower() in filename_lower:
                 return doc_type
 
@@ -380,68 +546,58 @@ class AIService:
         """Extract entities like names, dates, amounts, etc."""
         entities = []
 
-        # Extract potential names (capitalize words)
-        name_pattern = r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b'
-        names = re.findall(name_pattern, content)
-
-        # Filter common legal terms
-        legal_stopwords = {'Court', 'Judge', 'Justice', 'Honorable', 'Section', 'Act', 'Rule', 'Order'}
-        names = [name for name in names if name not in legal_stopwords and len(name) > 2]
-
-        for name in set(names[:10]):  # Limit to top 10
-            entities.append({"type": "Person", "value": name})
+        # Extract potential names (capitalize words), stopping at the first 10 distinct ones
+        names = set()
+        for match in _NAME_RE.finditer(content):
+            name = match.group(0)
+            if len(name) > 2 and name not in _LEGAL_STOPWORDS and name not in names:
+                names.add(name)
+                entities.append({"type": "Person", "value": name})
+                if len(names) >= MAX_NAME_ENTITIES:
+                    break
 
         # Extract amounts
-        amount_pattern = r'(?:Rs\.?|₹|\$)\s*(\d+(?:,\d+)*(?:\.\d+)?)'
-        amounts = re.findall(amount_pattern, content, re.IGNORECASE)
-        for amount in amounts:
-            entities.append({"type": "Amount", "value": f"₹{amount}"})
+        for match in itertools.islice(_AMOUNT_RE.finditer(content), MAX_PATTERN_ENTITIES):
+            entities.append({"type": "Amount", "value": f"₹{match.group(1)}"})
 
         # Extract case numbers
-        case_pattern = r'(?:Case|FIR|Complaint)[\s\w]*?No\.?\s*(\w+/\d+/\d+|\d+/\d+)'
-        case_numbers = re.findall(case_pattern, content, re.IGNORECASE)
-        for case_num in case_numbers:
-            entities.append({"type": "Case Number", "value": case_num})
+        for match in itertools.islice(_CASE_NUMBER_RE.finditer(content), MAX_PATTERN_ENTITIES):
+            entities.append({"type": "Case Number", "value": match.group(1)})
 
         return entities
 
-    def _generate_summary(self, content: str) -> str:
-        """Generate a brief summary of the document"""
-        try:
-            sentences = sent_tokenize(content)
-            if len(sentences) <= 3:
-                return content
-
-            # Simple extractive summarization
-            # Take the first sentence, a middle sentence, and potentially the last
-            summary_sentences = []
+    def _generate_summary(self, content: str, sentences: Optional[Sequence[str]]) -> str:
+        """Generate a brief summary of the document from its sentences"""
+        if sentences is None:
+            # Fallback: return first 200 characters
+            return content[:200] + "..." if len(content) > 200 else content
 
-            if sentences:
-                summary_sentences.append(sentences[0])  # First sentence
+        if len(sentences) <= 3:
+            return content
 
-            if len(sentences) > 5:
-                mid_idx = len(sentences) // 2
-                summary_sentences.append(sentences[mid_idx])  # Middle sentence
+        # Simple extractive summarization
+        # Take the first sentence, a middle sentence, and potentially the last
+        summary_sentences = []
 
-            if len(sentences) > 2:
-                summary_sentences.append(sentences[-1])  # Last sentence
+        if sentences:
+            summary_sentences.append(sentences[0])  # First sentence
 
-            return " ".join(summary_sentences)
+        if len(sentences) > 5:
+            mid_idx = len(sentences) // 2
+            summary_sentences.append(sentences[mid_idx])  # Middle sentence
 
-        except Exception:
-            # Fallback: return first 200 characters
-            return content[:200] + "..." if len(content) > 200 else content
+        if len(sentences) > 2:
+            summary_sentences.append(sentences[-1])  # Last sentence
 
-    def _analyze_sentiment(self, content: str) -> str:
-        """Basic sentiment analysis"""
+        return " ".join(summary_sentences)
 
-        positive_words = ['agree', 'accept', 'approve', 'satisfied', 'success', 'win', 'favorable']
-        negative_words = ['dispute', 'deny', 'reject', 'fail', 'violation', 'breach', 'guilty', 'liable']
+    def _analyze_sentiment(self, content_lower: str) -> str:
+        """Basic sentiment analysis of lowercased (e.g. preprocessed) text"""
 
-        content_lower = content.lower()
+        found = _KEYWORDS.find(content_lower)
 
-        pos_count = sum(1 for word in positive_words if word in content_lower)
-        neg_count = sum(1 for word in negative_words if word in content_lower)
+        pos_count = len(found["positive"])
+        neg_count = len(found["negative"])
 
         if pos_count > neg_count:
             return "positive"
@@ -450,55 +606,33 @@ class AIService:
         else:
             return "neutral"
 
-    def _calculate_readability(self, content: str) -> float:
+    def _calculate_readability(self, words: Sequence[str], sentences: Optional[Sequence[str]]) -> float:
         """Simple readability score based on sentence and word length"""
-        try:
-            sentences = sent_tokenize(content)
-            words = content.split()
-
-            if not sentences or not words:
-                return 0
+        if sentences is None:
+            return 50  # Default neutral score
 
-            avg_sentence_length = len(words) / len(sentences)
-            avg_word_length = sum(len(word) for word in words) / len(words)
+        if not sentences or not words:
+            return 0
 
-            # Simple readability formula (lower is easier to read)
-            score = avg_sentence_length * 0.39 + avg_word_length * 11.8 - 15.59
-            return max(0, min(100, score))
+        avg_sentence_length = len(words) / len(sentences)
+        avg_word_length = sum(len(word) for word in words) / len(words)
 
-        except Exception:
-            return 50  # Default neutral score
+        # Simple readability formula (lower is easier to read)
+        score = avg_sentence_length * 0.39 + avg_word_length * 11.8 - 15.59
+        return max(0, min(100, score))
 
     def _extract_dates(self, content: str) -> List[str]:
         """Extract dates from content"""
 
-        # Various date patterns
-        date_patterns = [
-            r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b',  # DD/MM/YYYY or MM/DD/YYYY
-            r'\b\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{2,4}\b',  # DD Month YYYY
-            r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{2,4}\b',  # Month DD, YYYY
-        ]
-
-        dates = []
-        for pattern in date_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            dates.extend(matches)
+        dates = _DATE_RE.findall(content)
 
         return list(set(dates))  # Remove duplicates
 
-    def _extract_legal_keywords(self, content: str) -> List[str]:
-        """Extract important legal keywords and phrases"""
-
-        legal_terms = [
-            'plaintiff', 'defendant', 'petitioner', 'respondent', 'appellant', 'court',
-            'judgment', 'order', 'decree', 'injunction', 'damages', 'compensation',
-            'evidence', 'witness', 'testimony', 'affidavit', 'contract', 'agreement',
-            'breach', 'violation', 'liability', 'negligence', 'jurisdiction',
-            'appeal', 'revision', 'writ', 'habeas corpus', 'mandamus', 'certiorari'
-        ]
+    def _extract_legal_keywords(self, found: Dict[str, FrozenSet[str]]) -> List[str]:
+        """Extract important legal keywords and phrases from the keywords found in lowercased content"""
 
-        content_lower = content.lower()
-        found_terms = [term for term in legal_terms if term in content_lower]
+        legal = found["legal"]
+        found_terms = [term for term in _LEGAL_TERMS if term in legal]
 
         return found_terms
 
@@ -508,66 +642,87 @@ class AIService:
         """
         try:
             # Use provided cases or return empty list
-            if not all_cases:
+            if not all_cases or not SKLEARN_AVAILABLE:
                 return []
 
-            # Prepare query text
+            # Prepare query text; a query with no meaningful text matches nothing
             query_text = f"{case_title} {case_description}".strip()
             processed_query = self.preprocess_text(query_text)
+            if not processed_query:
+                return []
 
-            # Prepare case texts
-            case_texts = []
-            case_data = []
+            corpus_matrix, text_cases = self._get_corpus(all_cases)
+            if corpus_matrix is None:
+                return []
 
-            for case in all_cases:
-                case_text = f"{case.title} {case.description}".strip()
-                processed_case_text = self.preprocess_text(case_text)
+            # TF-IDF rows are L2-normalized, so one sparse matvec gives the cosine similarities
+            query_vector = self._corpus_vectorizer.transform([processed_query])
+            similarity_scores = (corpus_matrix @ query_vector.T).toarray().ravel()
 
-                if processed_case_text:  # Only include cases with meaningful text
-                    case_texts.append(processed_case_text)
-                    case_data.append({
+            # Get top similar cases
+            similar_indices = _top_k_indices(similarity_scores, limit)
+
+            similar_cases = []
+            for idx in similar_indices:
+                if similarity_scores[idx] > 0.1:  # Minimum similarity threshold
+                    case = text_cases[idx]
+                    similar_cases.append({
                         "id": str(case.id),
                         "case_number": case.case_number,
                         "title": case.title,
                         "description": case.description,
                         "case_type": case.case_type,
                         "status": case.status,
-                        "created_at": case.created_at
+                        "created_at": case.created_at,
+                        "similarity_score": float(similarity_scores[idx])
                     })
 
-            if not case_texts or not SKLEARN_AVAILABLE:
-                return []
-
-            # Calculate similarity using TF-IDF
-            all_texts = [processed_query] + case_texts
-
-            # Use existing vectorizer or create new one
-            if self.vectorizer and hasattr(self.vectorizer, 'fit_transform'):
-                tfidf_matrix = self.vectorizer.fit_transform(all_texts)
-            else:
-                from sklearn.feature_extraction.text import TfidfVectorizer
-                vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
-                tfidf_matrix = vectorizer.fit_transform(all_texts)
-
-            # Calculate cosine similarity
-            similarity_scores = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:]).flatten()
-
-            # Get top similar cases
-            similar_indices = similarity_scores.argsort()[-limit:][::-1]
-
-            similar_cases = []
-            for idx in similar_indices:
-                if similarity_scores[idx] > 0.1:  # Minimum similarity threshold
-                    case_info = case_data[idx].copy()
-                    case_info["similarity_score"] = float(similarity_scores[idx])
-                    similar_cases.append(case_info)
-
             return similar_cases
 
         except Exception as e:
             logger.error(f"Similar cases search error: {e}")
             return []
 
+    def _get_corpus(self, all_cases: List[Any]):
+        """
+        TF-IDF matrix of the case corpus and the cases behind its rows
+
+        Cases are only preprocessed and the matrix refitted when a case is
+        added, removed or updated (by id and updated_at).
+        """
+        fingerprint = (
+            len(all_cases),
+            hash(tuple((str(case.id), getattr(case, 'updated_at', None)) for case in all_cases))
+        )
+        if fingerprint != self._corpus_fingerprint:
+            case_texts = []
+            text_cases = []
+            for case in all_cases:
+                processed_case_text = self.preprocess_text(f"{case.title} {case.description}".strip())
+                if processed_case_text:  # Only include cases with meaningful text
+                    case_texts.append(processed_case_text)
+                    text_cases.append(case)
+
+            if case_texts:
+                # Kept separate from self.vectorizer, which belongs to the trained classifier
+                vectorizer = TfidfVectorizer(
+                    max_features=10000,
+                    ngram_range=(1, 2),
+                    stop_words='english',
+                    sublinear_tf=True,
+                    dtype=np.float32
+                )
+                # CSR keeps each case's row contiguous for the corpus @ query product
+                self._corpus_matrix = vectorizer.fit_transform(case_texts).tocsr()
+                self._corpus_vectorizer = vectorizer
+            else:
+                self._corpus_matrix = None
+                self._corpus_vectorizer = None
+            self._corpus_cases = text_cases
+            self._corpus_fingerprint = fingerprint
+
+        return self._corpus_matrix, self._corpus_cases
+
     async def generate_case_insights(self, case_data: Dict, all_cases: List[Any] = None) -> Dict:
         """
         Generate AI insights for a specific case
@@ -598,7 +753,7 @@ class AIService:
                 "similar_cases": similar_cases,
                 "recommendations": recommendations,
                 "complexity_analysis": complexity_analysis,
-                "generated_at": datetime.utcnow().isoformat()
+                "generated_at": _utc_now_iso()
             }
 
         except Exception as e:
@@ -648,22 +803,10 @@ class AIService:
 
         combined_text = f"{title} {description}".lower()
 
-        # Complexity indicators
-        complex_keywords = [
-            'multiple parties', 'cross-claim', 'counter-claim', 'class action',
-            'constitutional', 'international', 'corporate', 'merger', 'acquisition',
-            'intellectual property', 'patent', 'copyright', 'trademark',
-            'securities', 'fraud', 'conspiracy', 'racketeering'
-        ]
-
-        simple_keywords = [
-            'traffic violation', 'minor', 'simple', 'straightforward',
-            'routine', 'standard procedure', 'uncontested'
-        ]
-
         # Calculate complexity score
-        complex_score = sum(1 for keyword in complex_keywords if keyword in combined_text)
-        simple_score = sum(1 for keyword in simple_keywords if keyword in combined_text)
+        found = _KEYWORDS.find(combined_text)
+        complex_score = len(found["complex"])
+        simple_score = len(found["simple"])
 
         # Text length indicators
         word_count = len(description.split())
@@ -688,8 +831,19 @@ class AIService:
         }
 
 
-# Global AI service instance
-ai_service = AIService()
+# Global AI service instance, built on first use so importing this module stays cheap
+_ai_service: Optional[AIService] = None
+_ai_service_lock = threading.Lock()
+
+
+def get_ai_service() -> AIService:
+    """Get the AI service instance, loading NLTK data and models on the first call"""
+    global _ai_service
+    if _ai_service is None:
+        with _ai_service_lock:
+            if _ai_service is None:
+                _ai_service = AIService()
+    return _ai_service
 
 # Export the service
-__all__ = ['AIService', 'ai_service']
+__all__ = ['AIService', 'get_ai_service']
@@ -2,15 +2,61 @@
 Audit logging service for tracking all system mutations
 Records actor, action, before/after state for compliance and debugging
 """
-import json
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from sqlmodel import Session, select
+import orjson
+from sqlalchemy import event
+from sqlmodel import Session, func, select
 
-from app.core.database import get_session
+from app.core.database import engine, get_session
 from app.models.audit_log import AuditAction, AuditLog
+from app.models.case import Case
+from app.models.hearing import Hearing
 from app.models.user import User
+from app.services.analytics_service import analytics_service
+
+# Dates, enums, numpy values and non-string keys are encoded natively; anything else falls back to str()
+_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _to_json(data: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Serialize audit before/after state for the TEXT columns"""
+    return orjson.dumps(data, default=str, option=_JSON_OPTIONS).decode() if data else None
+
+
+# Session.info key holding the resource types whose cached analytics go stale when the session commits
+_STALE_RESOURCES_KEY = "audit_stale_resources"
+
+# Cached analytics resource type read from each table, for rows flushed without going through log_action
+_RESOURCE_TYPES = {Case: "case", User: "user", Hearing: "hearing", AuditLog: "audit"}
+
+
+def _invalidate_on_commit(session: Session, resource_type: str) -> None:
+    """Retire cached analytics for resource_type (and audit activity) once session commits"""
+    session.info.setdefault(_STALE_RESOURCES_KEY, set()).update((resource_type, "audit"))
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed_resources(session: Session, flush_context) -> None:
+    stale = {
+        _RESOURCE_TYPES[type(instance)]
+        for instance in (*session.new, *session.dirty, *session.deleted)
+        if type(instance) in _RESOURCE_TYPES
+    }
+    if stale:
+        session.info.setdefault(_STALE_RESOURCES_KEY, set()).update(stale)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    for resource_type in session.info.pop(_STALE_RESOURCES_KEY, ()):
+        analytics_service.invalidate(resource_type)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_uncommitted(session: Session) -> None:
+    session.info.pop(_STALE_RESOURCES_KEY, None)
 
 
 class AuditService:
@@ -52,31 +98,79 @@ class AuditService:
         Returns:
             Created AuditLog record
         """
-        # Serialize data to JSON
-        before_json = json.dumps(before_data, default=str) if before_data else None
-        after_json = json.dumps(after_data, default=str) if after_data else None
-
-        # Create audit log entry
-        audit_log = AuditLog(
+        audit_log = self._build_audit_log(
             action=action,
+            user=user,
             resource_type=resource_type,
             resource_id=resource_id,
-            before_data=before_json,
-            after_data=after_json,
+            before_data=before_data,
+            after_data=after_data,
             description=description,
-            user_id=user.id if user else None,
             case_id=case_id,
             ip_address=ip_address,
-            user_agent=user_agent,
-            created_at=datetime.utcnow()
+            user_agent=user_agent
         )
 
         session.add(audit_log)
+        _invalidate_on_commit(session, resource_type)
         session.commit()
         session.refresh(audit_log)
 
         return audit_log
 
+    def _build_audit_log(
+        self,
+        action: AuditAction,
+        user: Optional[User] = None,
+        resource_type: str = "unknown",
+        resource_id: Optional[int] = None,
+        before_data: Optional[Dict[str, Any]] = None,
+        after_data: Optional[Dict[str, Any]] = None,
+        description: Optional[str] = None,
+        case_id: Optional[int] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ) -> AuditLog:
+        """Create an AuditLog record without adding it to a session"""
+        return AuditLog(
+            action=action,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            before_data=_to_json(before_data),
+            after_data=_to_json(after_data),
+            description=description,
+            user_id=user.id if user else None,
+            case_id=case_id,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            created_at=datetime.utcnow()
+        )
+
+    def log_in_new_session(
+        self,
+        log_method: Callable[..., AuditLog],
+        user_id: Optional[int] = None,
+        **kwargs: Any
+    ) -> None:
+        """
+        Run an audit logging method on its own database session
+
+        Intended for FastAPI BackgroundTasks, which run after the request's
+        session may already be closed. The acting user is passed by id and
+        loaded here, since the request's User instance is expired once its
+        session commits.
+
+        Args:
+            log_method: One of the log_* methods of this service
+            user_id: ID of the user who performed the action
+            **kwargs: Arguments for log_method, excluding session and user
+        """
+        with Session(engine) as session:
+            user = session.get(User, user_id) if user_id is not None else None
+            log_method(session=session, user=user, **kwargs)
+            # Bulk methods only add their records; commit them here
+            session.commit()
+
     def log_case_creation(
         self,
         session: Session,
@@ -111,15 +205,19 @@ class AuditService:
         user_agent: Optional[str] = None
     ) -> AuditLog:
         """Log case update"""
-        # Identify what changed
-        changes = []
-        for key in set(before_data.keys()) | set(after_data.keys()):
-            before_val = before_data.get(key)
-            after_val = after_data.get(key)
-            if before_val != after_val:
-                changes.append(f"{key}: {before_val} → {after_val}")
-
-        description = f"Case updated: {', '.join(changes)}" if changes else "Case updated"
+        # Identify what changed as {field: [old, new]}; a key missing on one side counts as None
+        changes = {}
+        if before_data != after_data:
+            for key, after_val in after_data.items():
+                before_val = before_data.get(key)
+                if before_val != after_val:
+                    changes[key] = [before_val, after_val]
+            for key, before_val in before_data.items():
+                if key not in after_data and before_val is not None:
+                    changes[key] = [before_val, None]
+
+        # The audit log has no diff column, so the structured diff is stored as JSON in the description
+        description = f"Case updated: {_to_json(changes)}" if changes else "Case updated"
 
         return self.log_action(
             session=session,
@@ -208,6 +306,49 @@ class AuditService:
             user_agent=user_agent
         )
 
+    def log_hearings_scheduled_bulk(
+        self,
+        session: Session,
+        user: User,
+        hearings: List[Tuple[Dict[str, Any], int, int]],
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ) -> List[AuditLog]:
+        """
+        Add hearing-scheduled audit logs for many hearings at once
+
+        The records are only added to the session; the caller commits them
+        together with the hearings they describe.
+
+        Args:
+            session: Database session
+            user: User who scheduled the hearings
+            hearings: (hearing_data, hearing_id, case_id) for each hearing
+            ip_address: User's IP address
+            user_agent: User's browser/client info
+
+        Returns:
+            Added AuditLog records
+        """
+        audit_logs = [
+            self._build_audit_log(
+                action=AuditAction.SCHEDULE_HEARING,
+                user=user,
+                resource_type="hearing",
+                resource_id=hearing_id,
+                after_data=hearing_data,
+                description=f"Hearing scheduled for case on {hearing_data.get('hearing_date')}",
+                case_id=case_id,
+                ip_address=ip_address,
+                user_agent=user_agent
+            )
+            for hearing_data, hearing_id, case_id in hearings
+        ]
+        session.add_all(audit_logs)
+        if audit_logs:
+            _invalidate_on_commit(session, "hearing")
+        return audit_logs
+
     def log_user_login(
         self,
         session: Session,
@@ -334,25 +475,22 @@ class AuditService:
         Returns:
             Summary of audit activities for the case
         """
-        statement = select(AuditLog).where(AuditLog.case_id == case_id)
-        audit_logs = list(session.exec(statement).all())
+        for_case = AuditLog.case_id == case_id
 
         # Group by action type
-        action_counts = {}
-        first_action = None
-        last_action = None
-
-        for log in audit_logs:
-            action_counts[log.action.value] = action_counts.get(log.action.value, 0) + 1
+        action_rows = session.exec(
+            select(AuditLog.action, func.count(AuditLog.id)).where(for_case).group_by(AuditLog.action)
+        ).all()
+        action_counts = {action.value: count for action, count in action_rows}
 
-            if first_action is None or log.created_at < first_action.created_at:
-                first_action = log
-            if last_action is None or log.created_at > last_action.created_at:
-                last_action = log
+        # First and last entries come straight off the (case_id, created_at) index
+        entry_columns = select(AuditLog.action, AuditLog.user_id, AuditLog.created_at).where(for_case)
+        first_action = session.exec(entry_columns.order_by(AuditLog.created_at).limit(1)).first()
+        last_action = session.exec(entry_columns.order_by(AuditLog.created_at.desc()).limit(1)).first()
 
         return {
             "case_id": case_id,
-            "total_audit_entries": len(audit_logs),
+            "total_audit_entries": sum(action_counts.values()),
             "action_counts": action_counts,
             "first_action": {
                 "action": first_action.action.value,
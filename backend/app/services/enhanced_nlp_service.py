@@ -6,7 +6,6 @@ Production-ready service for Day 3 capstone completion
 
 import json
 import os
-import pickle
 from pathlib import Path
 from typing import Dict, List
 
@@ -289,10 +288,13 @@ class BNSClassificationService:
 
             # Load model
             try:
-                with open(self.model_path, 'rb') as f:
-                    model_data = pickle.load(f)
-                    self.model = model_data['model']
-                    self.vectorizer = model_data['vectorizer']
+                # joblib ships with scikit-learn; missing ML libraries leave the service in fallback mode
+                import joblib
+
+                # Memory-map the model's arrays: pages load on demand and are shared by forked workers
+                model_data = joblib.load(self.model_path, mmap_mode='r')
+                self.model = model_data['model']
+                self.vectorizer = model_data['vectorizer']
             except Exception as e:
                 print(f"❌ Failed to load enhanced model: {e}")
                 self.is_enhanced_model_available = False
@@ -6,12 +6,51 @@ import heapq
 from datetime import date, time, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
+from sqlmodel import Session, select
+
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.database import engine
 from app.models.bench import Bench
 from app.models.case import Case, CaseTrack
 from app.models.hearing import Hearing, HearingCreate, HearingStatus
 from app.models.user import User, UserRole
 
+# Active benches and judges change on the order of minutes, so allocations reuse them briefly
+SCHEDULING_RESOURCES_TTL_SECONDS = 60
+_scheduling_resources_cache = TTLCache(maxsize=2, ttl=SCHEDULING_RESOURCES_TTL_SECONDS)
+
+
+def get_active_benches() -> List[Bench]:
+    """Return active benches, detached from any session and cached for a short TTL"""
+    benches = _scheduling_resources_cache.get("benches")
+    if benches is None:
+        with Session(engine) as session:
+            benches = list(session.exec(select(Bench).where(Bench.is_active)).all())
+        # An empty result is not cached, so the first bench created is picked up immediately
+        if benches:
+            _scheduling_resources_cache.set("benches", benches)
+    return benches
+
+
+def get_active_judges() -> List[User]:
+    """Return active judges and admins, detached from any session and cached for a short TTL"""
+    judges = _scheduling_resources_cache.get("judges")
+    if judges is None:
+        with Session(engine) as session:
+            judges = list(session.exec(
+                select(User).where(User.role.in_([UserRole.JUDGE, UserRole.ADMIN]), User.is_active)
+            ).all())
+        # An empty result is not cached, so the first judge created is picked up immediately
+        if judges:
+            _scheduling_resources_cache.set("judges", judges)
+    return judges
+
+
+def invalidate_scheduling_resources() -> None:
+    """Drop cached benches and judges after bench or user writes"""
+    _scheduling_resources_cache.invalidate()
+
 
 class SchedulingResult:
     """Result of scheduling operation"""
@@ -177,6 +216,14 @@ class CaseScheduler:
             # Use negative score for max heap behavior
             heapq.heappush(case_priority_heap, (-priority_score, case.id, case))
 
+        # No bench can take any case once its capacity drops below the shortest case
+        shortest_duration = min((case.estimated_duration_minutes for case in unscheduled_cases), default=0)
+
+        # Group existing hearings by date once instead of rescanning them every day
+        hearings_by_date: Dict[date, List[Hearing]] = {}
+        for hearing in existing_hearings:
+            hearings_by_date.setdefault(hearing.hearing_date, []).append(hearing)
+
         # Track scheduling statistics
         stats = {
             "total_cases": len(unscheduled_cases),
@@ -191,7 +238,7 @@ class CaseScheduler:
             current_date = start_date + timedelta(days=day_offset)
 
             # Get available slots for this date
-            date_hearings = [h for h in existing_hearings if h.hearing_date == current_date]
+            date_hearings = hearings_by_date.get(current_date, [])
             available_slots = self.get_available_slots_for_date(
                 current_date, date_hearings, benches
             )
@@ -199,11 +246,18 @@ class CaseScheduler:
             daily_scheduled = 0
             daily_duration = 0
 
-            # Process cases in priority order
+            largest_capacity = max(available_slots.values(), default=0)
+
+            # Process cases in priority order until the day is full
             temp_heap = []
-            while case_priority_heap:
+            while case_priority_heap and largest_capacity >= shortest_duration:
                 neg_priority, case_id, case = heapq.heappop(case_priority_heap)
 
+                # Cases longer than every bench's remaining capacity wait for a later day
+                if case.estimated_duration_minutes > largest_capacity:
+                    temp_heap.append((neg_priority, case_id, case))
+                    continue
+
                 # Try to schedule this case
                 bench_assignment = self.find_best_bench_and_time(
                     case, current_date, available_slots, judges
@@ -228,6 +282,7 @@ class CaseScheduler:
 
                     # Update available slots
                     available_slots[bench_id] -= case.estimated_duration_minutes
+                    largest_capacity = max(available_slots.values())
 
                     # Update statistics
                     daily_scheduled += 1
@@ -239,9 +294,10 @@ class CaseScheduler:
                     # Can't schedule today, try again later
                     temp_heap.append((neg_priority, case_id, case))
 
-            # Put unscheduled cases back in heap for next day
-            for item in temp_heap:
-                heapq.heappush(case_priority_heap, item)
+            # Put unscheduled cases back in heap for next day (heapify is linear)
+            if temp_heap:
+                case_priority_heap.extend(temp_heap)
+                heapq.heapify(case_priority_heap)
 
             # Record daily stats
             stats["scheduling_dates"].append({
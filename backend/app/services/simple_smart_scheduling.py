@@ -3,16 +3,28 @@ Simplified Smart Scheduling Service
 Working version with core functionality
 """
 
-from datetime import datetime, time, timedelta
+from datetime import date, datetime, time, timedelta
 from enum import Enum
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
 
-from sqlmodel import Session, select
+from sqlmodel import Session, func, select
 
+from app.core.cache import TTLCache
 from app.models.bench import Bench
 from app.models.case import Case, CasePriority, CaseStatus
 from app.models.hearing import Hearing
 from app.models.user import User, UserRole
+from app.services.scheduler import invalidate_scheduling_resources
+
+# Booked hearing counts per date; entries are dropped when hearings on that date are written
+BUSY_SLOTS_TTL_SECONDS = 300
+_busy_slots_cache = TTLCache(maxsize=1024, ttl=BUSY_SLOTS_TTL_SECONDS)
+
+
+def invalidate_busy_slots(hearing_dates: Iterable[date]) -> None:
+    """Drop cached hearing counts for dates whose hearings changed"""
+    for hearing_date in hearing_dates:
+        _busy_slots_cache.invalidate(hearing_date)
 
 
 class SchedulingStrategy(str, Enum):
@@ -46,6 +58,7 @@ class SimpleSmartSchedulingService:
                 session.add(default_bench)
                 session.commit()
                 session.refresh(default_bench)
+                invalidate_scheduling_resources()
                 benches = [default_bench]
 
             # Calculate theoretical slots
@@ -56,15 +69,11 @@ class SimpleSmartSchedulingService:
             daily_slots = 8  # 9 AM to 5 PM
             total_slots = working_days * daily_slots * len(benches)
 
-            # Get existing hearings
-            existing_hearings = list(session.exec(
-                select(Hearing).where(
-                    Hearing.hearing_date >= start_date.date(),
-                    Hearing.hearing_date <= end_date.date()
-                )
-            ).all())
+            # Count existing hearings per date, reusing cached dates
+            dates = [start_date.date() + timedelta(days=i) for i in range(days)]
+            busy_slots = self._busy_slots_by_date(session, dates)
 
-            available_slots = total_slots - len(existing_hearings)
+            available_slots = total_slots - sum(busy_slots.values())
 
             return {
                 "status": "success",
@@ -89,6 +98,30 @@ class SimpleSmartSchedulingService:
                 "slots": []
             }
 
+    def _busy_slots_by_date(self, session: Session, dates: List[date]) -> Dict[date, int]:
+        """Hearing counts for each date, querying only dates missing from the cache"""
+        busy_slots = {}
+        missing_dates = []
+        for hearing_date in dates:
+            count = _busy_slots_cache.get(hearing_date)
+            if count is None:
+                missing_dates.append(hearing_date)
+            else:
+                busy_slots[hearing_date] = count
+
+        if missing_dates:
+            fetched = dict(session.exec(
+                select(Hearing.hearing_date, func.count(Hearing.id))
+                .where(Hearing.hearing_date >= missing_dates[0], Hearing.hearing_date <= missing_dates[-1])
+                .group_by(Hearing.hearing_date)
+            ).all())
+            for hearing_date in missing_dates:
+                count = fetched.get(hearing_date, 0)
+                _busy_slots_cache.set(hearing_date, count)
+                busy_slots[hearing_date] = count
+
+        return busy_slots
+
     def suggest_optimal_schedule_simple(self, session: Session, days_ahead: int = 14) -> Dict[str, Any]:
         """Simple optimization suggestions"""
         try:
@@ -0,0 +1,46 @@
+"""
+FastAPI application entry point
+"""
+from app.core.config import settings
+from app.core.database import create_db_and_tables, engine
+from app.core.query_counter import setup_query_counter
+from app.routers import analytics, auth, cases, nlp, reports, schedule, users
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+
+def create_app() -> FastAPI:
+    """Build the application with its routers and middleware"""
+    app = FastAPI(title=settings.APP_NAME, version=settings.APP_VERSION)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[origin.strip() for origin in settings.CORS_ORIGINS.split(",")],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Per-request query counts are only logged in DEBUG
+    setup_query_counter(app, engine)
+
+    app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
+    app.include_router(cases.router, prefix="/cases", tags=["Cases"])
+    app.include_router(schedule.router, prefix="/schedule", tags=["Scheduling"])
+    app.include_router(reports.router, prefix="/reports", tags=["Reports"])
+    app.include_router(nlp.router, prefix="/nlp", tags=["NLP"])
+    app.include_router(users.router, prefix="/users", tags=["Users"])
+    app.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
+
+    @app.on_event("startup")
+    def on_startup():
+        create_db_and_tables()
+
+    @app.get("/")
+    async def root():
+        return {"message": settings.APP_NAME, "version": settings.APP_VERSION}
+
+    return app
+
+
+app = create_app()
@@ -37,13 +37,13 @@ from pydantic import BaseModel, Field
 
 # Import AI service
 try:
-    from app.services.ai_service import ai_service
+    from app.services.ai_service import get_ai_service
     AI_ENABLED = True
     print("✅ AI Services loaded successfully")
 except ImportError as e:
     AI_ENABLED = False
     print(f"⚠️ AI Services not available: {e}")
-    ai_service = None
+    get_ai_service = None
 
 # Configure logging
 logging.basicConfig(level=getattr(logging, config.log_level))
@@ -816,7 +816,7 @@ async def classify_case_ai(
         raise HTTPException(status_code=503, detail="AI services not available")
 
     try:
-        classification = await ai_service.classify_case(request.description, request.title)
+        classification = await get_ai_service().classify_case(request.description, request.title)
         return {
             "success": True,
             "classification": classification,
@@ -837,7 +837,7 @@ async def analyze_document_ai(
         raise HTTPException(status_code=503, detail="AI services not available")
 
     try:
-        analysis = await ai_service.analyze_document_content(request.content, request.filename)
+        analysis = await get_ai_service().analyze_document_content(request.content, request.filename)
         return {
             "success": True,
             "analysis": analysis,
@@ -860,7 +860,7 @@ async def find_similar_cases_ai(
     try:
         # Get all cases for similarity comparison
         all_cases = await Case.find().to_list()
-        similar_cases = await ai_service.find_similar_cases(
+        similar_cases = await get_ai_service().find_similar_cases(
             request.description,
             request.title,
             limit=request.limit,
@@ -906,7 +906,7 @@ async def get_case_insights(
         # Get all cases for similarity comparison
         all_cases = await Case.find().to_list()
 
-        insights = await ai_service.generate_case_insights(case_data, all_cases)
+        insights = await get_ai_service().generate_case_insights(case_data, all_cases)
 
         return {
             "success": True,
@@ -932,11 +932,11 @@ async def smart_create_case_suggestions(
 
     try:
         # Classify the potential case
-        classification = await ai_service.classify_case(description, title)
+        classification = await get_ai_service().classify_case(description, title)
 
         # Find similar existing cases
         all_cases = await Case.find().to_list()
-        similar_cases = await ai_service.find_similar_cases(
+        similar_cases = await get_ai_service().find_similar_cases(
             description, title, limit=3, all_cases=all_cases
         )
 
@@ -1032,7 +1032,7 @@ async def get_ai_dashboard_analytics(
             "top_case_types": [{"type": k, "count": v} for k, v in top_case_types],
             "priority_distribution": priorities,
             "recent_ai_activities": ai_activities,
-            "model_info": ai_service.model_info if ai_service.model_info else "Basic Classification Model"
+            "model_info": get_ai_service().model_info or "Basic Classification Model"
         }
 
         return {
@@ -1070,7 +1070,7 @@ async def get_ai_status():
         "ai_enabled": True,
         "message": "AI services are running",
         "features_available": features,
-        "model_info": ai_service.model_info if ai_service.model_info else None
+        "model_info": get_ai_service().model_info or None
     }
 
 @app.get("/api/cases/{case_id}/documents")
@@ -0,0 +1,86 @@
+"""
+Shared fixtures: a throwaway SQLite database, an authenticated client and a query budget
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+
+# Must be set before app.core.config is imported
+_DB_DIR = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ["DEBUG"] = "true"
+
+from app.core.cache import TTLCache  # noqa: E402
+from app.core.database import create_db_and_tables, engine  # noqa: E402
+from app.core.query_counter import count_queries, install_query_counter  # noqa: E402
+from app.core.security import get_current_user  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+from app.routers import reports  # noqa: E402
+from app.services.analytics_service import analytics_service  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from main import create_app  # noqa: E402
+from sqlmodel import Session  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Create the schema once and count statements on the test engine"""
+    create_db_and_tables()
+    install_query_counter(engine)
+    yield engine
+
+
+@pytest.fixture
+def admin_user(database):
+    """Persisted admin used as the authenticated user"""
+    with Session(database) as session:
+        user = session.get(User, 1)
+        if user is None:
+            user = User(
+                id=1,
+                username="admin",
+                email="admin@example.com",
+                full_name="Test Admin",
+                role=UserRole.ADMIN,
+                is_active=True,
+                hashed_password="not-a-real-hash",
+            )
+            session.add(user)
+            session.commit()
+            session.refresh(user)
+        return user
+
+
+@pytest.fixture
+def client(admin_user, monkeypatch):
+    """TestClient authenticated as admin_user, with cold caches"""
+    monkeypatch.setattr(analytics_service, "_cache", TTLCache())
+    monkeypatch.setattr(reports, "_metrics_cache", TTLCache())
+
+    app = create_app()
+    app.dependency_overrides[get_current_user] = lambda: admin_user
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Fail if the block executes more than budget SQL statements
+
+    Usage:
+        with query_budget(3):
+            client.get("/schedule/hearings?limit=100")
+    """
+    @contextmanager
+    def budget(max_queries: int):
+        with count_queries() as counter:
+            yield counter
+        assert counter.count <= max_queries, (
+            f"expected at most {max_queries} queries, got {counter.count}"
+        )
+
+    return budget
@@ -0,0 +1,38 @@
+"""
+Query budgets for the endpoints tuned against N+1 patterns
+
+A failure here means an endpoint started issuing more SQL per request;
+look for a lazy relationship load or a query inside a loop.
+"""
+
+
+def test_list_hearings_query_budget(client, query_budget):
+    with query_budget(3):
+        response = client.get("/schedule/hearings", params={"limit": 100})
+    assert response.status_code == 200
+
+
+def test_reports_metrics_query_budget(client, query_budget):
+    with query_budget(5):
+        response = client.get("/reports/metrics")
+    assert response.status_code == 200
+
+
+def test_analytics_dashboard_query_budget(client, query_budget):
+    with query_budget(3):
+        response = client.get("/analytics/dashboard")
+    assert response.status_code == 200
+    assert response.json()["status"] == "success"
+
+
+def test_list_users_query_budget(client, query_budget):
+    with query_budget(1):
+        response = client.get("/users/")
+    assert response.status_code == 200
+
+
+def test_cached_metrics_skip_the_database(client, query_budget):
+    client.get("/reports/metrics")
+    with query_budget(0):
+        response = client.get("/reports/metrics")
+    assert response.status_code == 200
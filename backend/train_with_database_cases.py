@@ -15,7 +15,7 @@ from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.metrics import classification_report, accuracy_score
 from sklearn.preprocessing import LabelEncoder
-import pickle
+import joblib
 import json
 from datetime import datetime
 import warnings
@@ -321,8 +321,8 @@ class EnhancedBNSClassifierV2:
             'bns_rules': self.bns_rules
         }
         
-        with open(filepath, 'wb') as f:
-            pickle.dump(model_data, f)
+        # Uncompressed so the service can memory-map the arrays with joblib.load(mmap_mode='r')
+        joblib.dump(model_data, filepath, compress=0)
         
         print(f"\n💾 Model saved to: {filepath}")
 